@@ -11,6 +11,8 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 60
 
     database_url: str
+    # Схему создаёт Alembic; create_all на старте — только по явному DB_CREATE_ALL=true
+    db_create_all: bool = False
 
     smtp_host: str = 'localhost'
     smtp_port: int = 1025
@@ -0,0 +1,39 @@
+from starlette.datastructures import Headers
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+
+PREFLIGHT_CACHE_SIZE = 256
+
+
+class CachedPreflightCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware с кэшем готовых preflight-ответов.
+
+    Конфигурация CORS статична, поэтому ответ на OPTIONS полностью определяется
+    парой Origin + Access-Control-Request-*; собираем его один раз и дальше отдаём
+    копию готовых заголовков.
+    """
+
+    def __init__(self, app: ASGIApp, **kwargs) -> None:
+        super().__init__(app, **kwargs)
+        self._preflight_cache: dict[tuple[str, str, str], tuple[int, bytes, list[tuple[bytes, bytes]]]] = {}
+
+    def preflight_response(self, request_headers: Headers) -> Response:
+        key = (
+            request_headers.get('origin', ''),
+            request_headers.get('access-control-request-method', ''),
+            request_headers.get('access-control-request-headers', ''),
+        )
+        cached = self._preflight_cache.get(key)
+        if cached is None:
+            response = super().preflight_response(request_headers)
+            # Ключ приходит от клиента, поэтому размер кэша ограничен
+            if len(self._preflight_cache) < PREFLIGHT_CACHE_SIZE:
+                self._preflight_cache[key] = (response.status_code, response.body, list(response.raw_headers))
+            return response
+
+        status_code, body, raw_headers = cached
+        response = Response(content=body, status_code=status_code)
+        response.raw_headers = list(raw_headers)
+        return response
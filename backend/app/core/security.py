@@ -1,30 +1,80 @@
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from collections import OrderedDict
 from typing import Any
 
-from jose import JWTError, jwt
+import jwt
+from fastapi.concurrency import run_in_threadpool
 
 from .config import get_settings
 
 
 ALGORITHM = 'HS256'
+TOKEN_CACHE_SIZE = 4096
+
+# Settings — lru_cache-синглтон, поэтому ключ и TTL можно прочитать один раз при импорте
+_SETTINGS = get_settings()
+_SECRET = _SETTINGS.secret_key
+_EXPIRE = _SETTINGS.access_token_expire_minutes
+
+# LRU уже проверенных токенов: (token, secret_key) -> payload.
+# Доступ из нескольких потоков (decode выполняется в threadpool), поэтому под локом.
+_token_cache: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+_token_cache_lock = threading.Lock()
 
 
 def create_access_token(subject: str, expires_minutes: int | None = None) -> str:
-    settings = get_settings()
-    expire_delta = timedelta(minutes=expires_minutes or settings.access_token_expire_minutes)
+    # JWT допускает числовые даты (Unix seconds) — обходимся без datetime
+    now = int(time.time())
     payload: dict[str, Any] = {
         'sub': subject,
-        'exp': datetime.now(tz=timezone.utc) + expire_delta,
-        'iat': datetime.now(tz=timezone.utc),
+        'iat': now,
+        'exp': now + (expires_minutes or _EXPIRE) * 60,
     }
-    return jwt.encode(payload, settings.secret_key, algorithm=ALGORITHM)
+    return jwt.encode(payload, _SECRET, algorithm=ALGORITHM)
+
+
+def _cache_get(key: tuple[str, str]) -> dict[str, Any] | None:
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+        if payload is not None:
+            _token_cache.move_to_end(key)
+        return payload
+
+
+def _cache_put(key: tuple[str, str], payload: dict[str, Any]) -> None:
+    with _token_cache_lock:
+        _token_cache[key] = payload
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+
+def _check_expiry(payload: dict[str, Any]) -> dict[str, Any]:
+    # Срок действия проверяется на каждый вызов, поэтому запись в кэше
+    # остаётся валидной до естественного истечения `exp`.
+    exp = payload.get('exp')
+    if exp is not None and exp <= time.time():
+        raise ValueError('Invalid token')
+    return dict(payload)
 
 
 def decode_access_token(token: str) -> dict[str, Any]:
-    settings = get_settings()
-    try:
-        return jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
-    except JWTError as exc:
-        raise ValueError('Invalid token') from exc
+    key = (token, _SECRET)
+    payload = _cache_get(key)
+    if payload is None:
+        # Кэшируем только проверку подписи и разбор payload; невалидные токены не кэшируются.
+        try:
+            payload = jwt.decode(token, _SECRET, algorithms=[ALGORITHM], options={'verify_exp': False})
+        except jwt.InvalidTokenError as exc:
+            raise ValueError('Invalid token') from exc
+        _cache_put(key, payload)
+    return _check_expiry(payload)
 
 
+async def decode_access_token_async(token: str) -> dict[str, Any]:
+    """Декодирует токен, не блокируя event loop: попадание в кэш обрабатывается сразу,
+    промах (HMAC + разбор JSON) уходит в threadpool."""
+    payload = _cache_get((token, _SECRET))
+    if payload is not None:
+        return _check_expiry(payload)
+    return await run_in_threadpool(decode_access_token, token)
@@ -1,4 +1,6 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from .core.config import get_settings
 
@@ -8,14 +10,27 @@ engine = create_async_engine(
     settings.database_url,
     echo=False,
     future=True,
-    pool_pre_ping=True,  # Проверка соединения перед использованием
+    pool_pre_ping=False,  # Без лишнего round trip на checkout; устаревшие соединения отсекает pool_recycle
     pool_recycle=3600,  # Пересоздание соединений каждый час
-    pool_size=10,
-    max_overflow=20,
+    pool_size=20,
+    max_overflow=10,
 )
 async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
 
 
+async def warm_up_pool() -> None:
+    """Заранее открывает pool_size соединений, чтобы первые запросы не платили за handshake."""
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(engine.pool.size())),
+        return_exceptions=True,
+    )
+    # Возвращаем в пул всё, что удалось открыть, даже если часть подключений упала
+    await asyncio.gather(*(conn.close() for conn in results if not isinstance(conn, BaseException)))
+    errors = [exc for exc in results if isinstance(exc, BaseException)]
+    if errors:
+        raise errors[0]
+
+
 async def get_session():
     async with async_session_factory() as session:
         yield session
@@ -6,7 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import get_settings
-from ..core.security import decode_access_token
+from ..core.security import decode_access_token_async
 from ..database import get_session
 from ..models import User
 
@@ -24,7 +24,7 @@ async def get_current_user(
     session: AsyncSession = Depends(get_session),
 ) -> User:
     try:
-        payload = decode_access_token(token)
+        payload = await decode_access_token_async(token)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid token')
 
@@ -57,7 +57,7 @@ async def get_current_user_optional(
         return None
     
     try:
-        payload = decode_access_token(token)
+        payload = await decode_access_token_async(token)
         user_id_str = payload.get('sub')
         if not user_id_str:
             return None
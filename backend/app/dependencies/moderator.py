@@ -6,7 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import get_settings
-from ..core.security import decode_access_token
+from ..core.security import decode_access_token_async
 from ..database import get_session
 from ..models import Moderator
 
@@ -23,7 +23,7 @@ async def get_current_moderator(
 ) -> Moderator:
     """Получить текущего модератора из токена"""
     try:
-        payload = decode_access_token(token)
+        payload = await decode_access_token_async(token)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
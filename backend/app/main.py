@@ -1,17 +1,23 @@
+import asyncio
+import logging
+
+import orjson
 from fastapi import APIRouter, FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
 from .core.config import get_settings
-from .database import engine
+from .core.cors import CachedPreflightCORSMiddleware
+from .database import engine, warm_up_pool
 from .models import Base
 from .routes import admin_router, auth_router, executions_router, questions_router, tasks_router, users_router, vacancies_router, hints_router, scoring_router, moderator_router, moderator_auth_router
 
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, default_response_class=ORJSONResponse)
 
 app.add_middleware(
-    CORSMiddleware,
+    CachedPreflightCORSMiddleware,
     allow_origins=['http://localhost:5173', 'http://127.0.0.1:5173', 'http://localhost:3000'],
     allow_credentials=True,
     allow_methods=['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'],
@@ -20,17 +26,44 @@ app.add_middleware(
 )
 
 
-# Миграции выполняются через Alembic
-# Для разработки можно раскомментировать строки ниже для автоматического создания таблиц
-# @app.on_event('startup')
-# async def on_startup():
-#     async with engine.begin() as conn:
-#         await conn.run_sync(Base.metadata.create_all)
+_warm_up_task: asyncio.Task | None = None
+
+
+async def _warm_up_pool_in_background() -> None:
+    try:
+        await warm_up_pool()
+    except Exception as exc:
+        # Недоступная БД не должна валить воркер — пул доберёт соединения лениво
+        logger.warning('Failed to warm up DB connection pool: %s', exc)
+
+
+# Миграции выполняются через Alembic / scripts/bootstrap_seed.py один раз перед деплоем.
+# create_all — только по явному DB_CREATE_ALL: таблицы, созданные в обход Alembic, ломают
+# следующий `alembic upgrade head`, а при нескольких воркерах каждый шлёт свой CREATE TABLE.
+@app.on_event('startup')
+async def on_startup():
+    if settings.db_create_all:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    # Прогрев идёт в фоне: медленная или недоступная БД не задерживает старт и /health
+    global _warm_up_task
+    _warm_up_task = asyncio.create_task(_warm_up_pool_in_background())
+
+
+@app.on_event('shutdown')
+async def on_shutdown():
+    if _warm_up_task is not None and not _warm_up_task.done():
+        _warm_up_task.cancel()
+
+
+# Health-пробы приходят часто и ответ всегда один — отдаём заранее закодированные байты
+_HEALTH_BYTES = orjson.dumps({'status': 'ok'})
+_HEALTH_HEADERS = {'content-type': 'application/json', 'content-length': str(len(_HEALTH_BYTES))}
 
 
-@app.get('/health', tags=['health'])
+@app.get('/health', tags=['health'], response_class=Response)
 async def health():
-    return {'status': 'ok'}
+    return Response(content=_HEALTH_BYTES, headers=_HEALTH_HEADERS)
 
 
 api_router = APIRouter(prefix=settings.api_v1_str)
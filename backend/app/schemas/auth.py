@@ -1,10 +1,30 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, Field, StringConstraints, field_validator
 
 from .user import UserRead
 
 
+# Дешёвая проверка формата вместо email-validator на каждом запросе логина/верификации.
+# Паттерн компилируется pydantic-core один раз при построении схемы.
+_EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+
+
+def _normalize_email(value: str) -> str:
+    # Как и EmailStr: домен регистронезависим, локальная часть сохраняется как есть.
+    local, _, domain = value.rpartition('@')
+    return f'{local}@{domain.lower()}'
+
+
+EmailField = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, pattern=_EMAIL_PATTERN, max_length=254),
+    AfterValidator(_normalize_email),
+]
+
+
 class AuthRegisterRequest(BaseModel):
-    email: EmailStr
+    email: EmailField
     full_name: str = Field(..., max_length=255, description='ФИО (минимум 3 слова)')
 
     @field_validator('full_name')
@@ -18,17 +38,17 @@ class AuthRegisterRequest(BaseModel):
 
 
 class AuthLoginRequest(BaseModel):
-    email: EmailStr
+    email: EmailField
     password: str = Field(..., min_length=8, max_length=128)
 
 
 class AuthCodeVerify(BaseModel):
-    email: EmailStr
+    email: EmailField
     code: str = Field(..., min_length=6, max_length=6)
 
 
 class AuthRequestCode(BaseModel):
-    email: EmailStr
+    email: EmailField
 
 
 class TokenResponse(BaseModel):
@@ -1,4 +1,5 @@
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 
 from pydantic import BaseModel, EmailStr
@@ -17,7 +18,9 @@ class UserRead(BaseModel):
         from_attributes = True
 
 
-class DashboardSnapshot(BaseModel):
+# Ответ собирается сервером из доверенных данных, валидация на выходе не нужна
+@dataclass(slots=True)
+class DashboardSnapshot:
     last_executor_status: str
     pending_jobs: int
     last_language: str
@@ -1,5 +1,6 @@
 """Генерация реальных задач через ML сервис (Groq AI)"""
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -10,124 +11,174 @@ sys.path.insert(0, str(backend_root))
 
 from app.database import async_session_factory
 from app.models import Task, Vacancy
-from sqlalchemy import select
+from sqlalchemy import delete, select
 import httpx
-import json
+import orjson
 
 
 ML_SERVICE_URL = "http://ml:8002/api/v1"
+ML_MAX_CONCURRENCY = 8
+DIFFICULTIES = ('easy', 'medium', 'hard')
 
 
-async def generate_task_via_ml(difficulty: str, language: str, topic: str = "algorithms"):
+async def generate_task_via_ml(client: httpx.AsyncClient, difficulty: str, language: str, topic: str = "algorithms"):
     """Генерирует задачу через ML сервис"""
     print(f"   🤖 Генерирую задачу: {difficulty}/{language}...", flush=True)
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        try:
-            response = await client.post(
-                f"{ML_SERVICE_URL}/generate-task",
-                json={
-                    "difficulty": difficulty,
-                    "language": language,
-                    "topic": topic
-                }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"   ✅ Задача сгенерирована: {data.get('title', 'Без названия')}", flush=True)
-                return data
-            else:
-                print(f"   ❌ Ошибка ML API: {response.status_code} - {response.text}", flush=True)
-                return None
-                
-        except Exception as e:
-            print(f"   ❌ Ошибка при генерации: {e}", flush=True)
+    try:
+        response = await client.post(
+            f"{ML_SERVICE_URL}/generate-task",
+            json={
+                "difficulty": difficulty,
+                "language": language,
+                "topic": topic
+            }
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"   ✅ Задача сгенерирована: {data.get('title', 'Без названия')}", flush=True)
+            return data
+        else:
+            print(f"   ❌ Ошибка ML API: {response.status_code} - {response.text}", flush=True)
             return None
+            
+    except Exception as e:
+        print(f"   ❌ Ошибка при генерации: {e}", flush=True)
+        return None
+
+
+def build_task(task_data: dict, difficulty: str, vacancy_id) -> Task:
+    """Собирает ORM-объект задачи из ответа ML сервиса"""
+    # Формируем полное описание задачи с форматами
+    full_description = task_data.get('description', '')
+    if task_data.get('input_format'):
+        full_description += f"\n\n**Формат входных данных:**\n{task_data['input_format']}"
+    if task_data.get('output_format'):
+        full_description += f"\n\n**Формат выходных данных:**\n{task_data['output_format']}"
+    if task_data.get('constraints'):
+        full_description += f"\n\n**Ограничения:**\n{task_data['constraints']}"
+    
+    return Task(
+        title=task_data.get('title', f'Задача {difficulty}'),
+        description=full_description,
+        topic=task_data.get('topic', 'algorithms'),
+        difficulty=difficulty,
+        open_tests=orjson.dumps(task_data.get('examples', [])).decode(),
+        hidden_tests=orjson.dumps(task_data.get('hidden_tests_full', [])).decode(),
+        canonical_solution=task_data.get('canonical_solution', ''),
+        hints=task_data.get('hints', []),
+        vacancy_id=vacancy_id,
+    )
 
 
-async def generate_tasks_for_vacancies():
-    """Генерирует задачи для всех вакансий через Groq AI"""
-    async with async_session_factory() as session:
-        # Получаем все вакансии
-        vacancies = await session.scalars(select(Vacancy))
-        vacancies_list = list(vacancies.all())
+async def save_vacancy_tasks(session, vacancy, new_tasks: list[Task]) -> bool:
+    """Заменяет задачи вакансии внутри SAVEPOINT общей транзакции"""
+    try:
+        async with session.begin_nested():
+            # Удаляем старые заглушки-задачи для этой вакансии одним DELETE, не загружая строки
+            result = await session.execute(delete(Task).where(Task.vacancy_id == vacancy.id))
+            if result.rowcount:
+                print(f"   🗑️  Удалено {result.rowcount} старых задач-заглушек")
+            session.add_all(new_tasks)
+    except Exception as e:
+        # Откатывается только SAVEPOINT этой вакансии, остальные вакансии попадут в общий коммит
+        print(f"   ❌ Ошибка сохранения, изменения вакансии откатаны: {e}\n")
+        return False
+    return True
+
+
+async def generate_tasks_for_vacancies(share_tasks: bool = False):
+    """Генерирует задачи для всех вакансий через Groq AI
+
+    Args:
+        share_tasks: Генерировать задачи один раз на (сложность, язык) и выдавать одинаковые
+            задачи всем вакансиям с этим языком (быстрее, но задачи у вакансий совпадут)
+    """
+    # Генерируем по 3 задачи разной сложности для каждой вакансии. Запросы к ML
+    # независимы, поэтому запускаем их параллельно, ограничивая число одновременных.
+    # Один клиент на весь прогон: соединения с ML сервисом переиспользуются через keep-alive
+    semaphore = asyncio.Semaphore(ML_MAX_CONCURRENCY)
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+    
+    # Транзакция БД не держится открытой на время генерации: вакансии читаются короткой сессией,
+    # а все задачи сохраняются одной транзакцией (один коммит) уже после ответов ML
+    async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+        async def generate_limited(difficulty: str, language: str):
+            async with semaphore:
+                return await generate_task_via_ml(
+                    client,
+                    difficulty=difficulty,
+                    language=language,
+                    topic="algorithms"
+                )
+        
+        # С share_tasks одинаковые (difficulty, language, topic) генерируются один раз
+        # (одновременные запросы ждут один и тот же future)
+        ml_cache: dict[tuple[str, str, str], asyncio.Future] = {}
+        
+        def generate_cached(difficulty: str, language: str) -> asyncio.Future:
+            key = (difficulty, language, "algorithms")
+            job = ml_cache.get(key) if share_tasks else None
+            if job is None:
+                job = ml_cache[key] = asyncio.ensure_future(generate_limited(difficulty, language))
+            return job
+        
+        vacancies_list = []
+        jobs = []
+        
+        # Вакансии читаем потоком: генерация для первых стартует, не дожидаясь остальных строк
+        async with async_session_factory() as session:
+            vacancies = await session.stream_scalars(select(Vacancy).execution_options(yield_per=50))
+            async for vacancy in vacancies:
+                vacancies_list.append(vacancy)
+                jobs.append(asyncio.gather(
+                    *(generate_cached(difficulty, vacancy.language) for difficulty in DIFFICULTIES)
+                ))
         
         if not vacancies_list:
             print("❌ Нет вакансий в базе данных")
             return
         
         print(f"\n📋 Найдено вакансий: {len(vacancies_list)}\n")
+        results = await asyncio.gather(*jobs)
         
-        for vacancy in vacancies_list:
-            print(f"🎯 Вакансия: {vacancy.title} ({vacancy.language})")
-            
-            # Удаляем старые заглушки-задачи для этой вакансии
-            old_tasks = await session.scalars(
-                select(Task).where(Task.vacancy_id == vacancy.id)
-            )
-            old_tasks_list = list(old_tasks.all())
-            
-            if old_tasks_list:
-                print(f"   🗑️  Удаляю {len(old_tasks_list)} старых задач-заглушек...")
-                for old_task in old_tasks_list:
-                    await session.delete(old_task)
-                await session.commit()
-            
-            # Генерируем 3 задачи разной сложности
-            difficulties = ['easy', 'medium', 'hard']
-            
-            for difficulty in difficulties:
-                # Генерируем задачу через ML
-                task_data = await generate_task_via_ml(
-                    difficulty=difficulty,
-                    language=vacancy.language,
-                    topic="algorithms"
-                )
+        saved = 0
+        async with async_session_factory() as session, session.begin():
+            for vacancy, vacancy_results in zip(vacancies_list, results):
+                print(f"🎯 Вакансия: {vacancy.title} ({vacancy.language})")
                 
-                if not task_data:
-                    print(f"   ⚠️  Пропускаю {difficulty} - не удалось сгенерировать")
-                    continue
+                new_tasks: list[Task] = []
+                for difficulty, task_data in zip(DIFFICULTIES, vacancy_results):
+                    if not task_data:
+                        print(f"   ⚠️  Пропускаю {difficulty} - не удалось сгенерировать")
+                        continue
+                    new_tasks.append(build_task(task_data, difficulty, vacancy.id))
                 
-                # Формируем полное описание задачи с форматами
-                full_description = task_data.get('description', '')
-                if task_data.get('input_format'):
-                    full_description += f"\n\n**Формат входных данных:**\n{task_data['input_format']}"
-                if task_data.get('output_format'):
-                    full_description += f"\n\n**Формат выходных данных:**\n{task_data['output_format']}"
-                if task_data.get('constraints'):
-                    full_description += f"\n\n**Ограничения:**\n{task_data['constraints']}"
+                if not new_tasks:
+                    print(f"   ⚠️  Ничего не сгенерировано, оставляю старые задачи\n")
+                    continue
                 
-                # Создаем задачу в БД
-                task = Task(
-                    title=task_data.get('title', f'Задача {difficulty}'),
-                    description=full_description,
-                    topic=task_data.get('topic', 'algorithms'),
-                    difficulty=difficulty,
-                    open_tests=json.dumps(task_data.get('examples', [])),
-                    hidden_tests=json.dumps(task_data.get('hidden_tests_full', [])),
-                    canonical_solution=task_data.get('canonical_solution', ''),
-                    hints=task_data.get('hints', []),
-                    vacancy_id=vacancy.id,
-                )
+                if not await save_vacancy_tasks(session, vacancy, new_tasks):
+                    continue
                 
-                session.add(task)
-                print(f"   💾 Сохранена задача: {task.title}")
+                saved += len(new_tasks)
+                for task in new_tasks:
+                    print(f"   💾 Сохранена задача: {task.title}")
+                print(f"   ✅ Завершено для {vacancy.title}\n")
             
-            await session.commit()
-            print(f"   ✅ Завершено для {vacancy.title}\n")
-        
-        print("🎉 Все задачи успешно сгенерированы!")
+        print(f"💾 Сохранено задач: {saved}")
+    print("🎉 Все задачи успешно сгенерированы!")
 
 
-async def main():
+async def main(share_tasks: bool = False):
     print("=" * 60)
     print("🚀 Генерация задач через Groq AI")
     print("=" * 60)
     print("\n⚠️  Это может занять 2-3 минуты (генерация через LLM)\n")
     
     try:
-        await generate_tasks_for_vacancies()
+        await generate_tasks_for_vacancies(share_tasks)
     except Exception as e:
         print(f"\n❌ Критическая ошибка: {e}")
         import traceback
@@ -135,4 +186,11 @@ async def main():
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--share-tasks',
+        action='store_true',
+        help='генерировать задачи один раз на (сложность, язык): вакансии с одним языком получат одинаковые задачи',
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.share_tasks))
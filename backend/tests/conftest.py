@@ -0,0 +1,5 @@
+import os
+
+# Settings читаются при импорте app.core.security — задаём обязательные поля до сбора тестов
+os.environ.setdefault('SECRET_KEY', 'test-secret-key')
+os.environ.setdefault('DATABASE_URL', 'sqlite+aiosqlite:///:memory:')
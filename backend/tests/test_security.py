@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import jwt
+import pytest
+
+from app.core import security
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    security._token_cache.clear()
+    yield
+    security._token_cache.clear()
+
+
+def test_roundtrip_and_cache_hit():
+    token = security.create_access_token('42')
+    assert security.decode_access_token(token)['sub'] == '42'
+    assert (token, security._SECRET) in security._token_cache
+    assert security.decode_access_token(token)['sub'] == '42'
+
+
+def test_returned_payload_does_not_alias_cache():
+    token = security.create_access_token('42')
+    security.decode_access_token(token)['sub'] = 'mutated'
+    assert security.decode_access_token(token)['sub'] == '42'
+
+
+def test_expired_token_rejected_although_signature_skips_exp():
+    now = int(time.time())
+    token = jwt.encode({'sub': '1', 'iat': now - 120, 'exp': now - 60}, security._SECRET, algorithm=security.ALGORITHM)
+    with pytest.raises(ValueError):
+        security.decode_access_token(token)
+
+
+def test_cached_token_expires(monkeypatch):
+    token = security.create_access_token('7', expires_minutes=1)
+    security.decode_access_token(token)
+    assert (token, security._SECRET) in security._token_cache
+
+    real_time = time.time
+    monkeypatch.setattr(security.time, 'time', lambda: real_time() + 120)
+    with pytest.raises(ValueError):
+        security.decode_access_token(token)
+    with pytest.raises(ValueError):
+        asyncio.run(security.decode_access_token_async(token))
+
+
+def test_invalid_token_not_cached():
+    token = jwt.encode({'sub': '1'}, 'other-secret', algorithm=security.ALGORITHM)
+    with pytest.raises(ValueError):
+        security.decode_access_token(token)
+    assert security._token_cache == {}
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(security, 'TOKEN_CACHE_SIZE', 2)
+    first, second, third = (security.create_access_token(str(i)) for i in range(3))
+    security.decode_access_token(first)
+    security.decode_access_token(second)
+    security.decode_access_token(first)
+    security.decode_access_token(third)
+    keys = [token for token, _ in security._token_cache]
+    assert keys == [first, third]
+
+
+def test_async_decode():
+    token = security.create_access_token('5')
+    assert asyncio.run(security.decode_access_token_async(token))['sub'] == '5'
+    assert asyncio.run(security.decode_access_token_async(token))['sub'] == '5'
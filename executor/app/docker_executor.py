@@ -2,67 +2,748 @@
 
 import asyncio
 import base64
+import binascii
+import functools
+import hashlib
+import io
+import logging
 import os
-import tempfile
+import shlex
+import shutil
+import tarfile
 import time
+import uuid
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-import docker
+import aiodocker
+
+
+logger = logging.getLogger(__name__)
+
+# Супервизоры судейского цикла (app/judge), копируются в /opt/judge каждого контейнера пула
+JUDGE_SOURCE_DIR = os.path.join(os.path.dirname(__file__), 'judge')
+JUDGE_INSTALL_DIR = '/opt/judge'
+
+# Контейнеры пула переиспользуются разными пользователями: код участника (и судейский цикл)
+# исполняется от nobody, а файлы запуска и /opt/judge принадлежат root и ему недоступны на запись.
+# Компиляторы запускаются от root — они не исполняют код участника.
+SANDBOX_USER = '65534:65534'
+
+# Чистка контейнера перед возвратом в пул (от root): общие записываемые директории и проверка,
+# что процессов nobody не осталось. Только что убитые SIGKILL процессы могут ещё завершаться
+# или висеть зомби до reap — зомби пропускаем, живых ждём до ~1 с, прежде чем выбросить контейнер.
+_SANDBOX_CLEANUP_SCRIPT = (
+    'find /tmp /var/tmp /dev/shm -mindepth 1 -maxdepth 1 -exec rm -rf {} +; '
+    'for attempt in 1 2 3 4 5 6 7 8 9 10; do '
+    'alive=0; '
+    'for p in /proc/[0-9]*; do '
+    '[ "$(stat -c %u $p 2>/dev/null)" = 65534 ] || continue; '
+    'grep -q "^State:[[:space:]]*Z" $p/status 2>/dev/null && continue; '
+    'alive=1; break; '
+    'done; '
+    '[ $alive = 0 ] && exit 0; '
+    'sleep 0.1; '
+    'done; '
+    'exit 1'
+)
+
+# Рабочая директория executor и её путь на хосте Docker-демона (Docker-in-Docker).
+# Если DOCKER_HOST_TMP_BASE задан, /workspace контейнеров пула — bind-mount поддиректории
+# TMP_BASE, и файлы запуска попадают в песочницу переименованием, без tar и put_archive.
+TMP_BASE = '/app/tmp'
+HOST_TMP_BASE = os.getenv('DOCKER_HOST_TMP_BASE')
+
+# Кэш артефактов компиляции (по sha256 исходников) — на той же tmpfs, что и запуски.
+# Работает в обоих режимах /workspace (bind-mount и tmpfs) для тёплых контейнеров;
+# разовый контейнер (_run_cold, пул занят) компилирует всегда
+ARTIFACT_CACHE_DIR = os.path.join(TMP_BASE, 'cache')
+ARTIFACT_CACHE_SIZE = 128
+# Какие файлы рабочей директории считаются результатом компиляции
+ARTIFACT_SUFFIXES = {
+    'typescript': ('.js',),
+    'java': ('.class',),
+    'go': ('main_bin',),
+}
+
+
+class _JudgeSession:
+    """Один долгоживущий exec с супервизором, через stdin которого гоняются все тесты.
+
+    Протокол запроса: <len>\\n<input>; ответа: <exit>\\n<len>\\n<stdout><len>\\n<stderr>.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._buffer = bytearray()
+
+    @classmethod
+    async def start(
+        cls, container, command: str, workdir: str, environment: list[str] | None = None
+    ) -> '_JudgeSession':
+        exec_obj = await container.exec(
+            cmd=command, stdout=True, stderr=True, stdin=True, workdir=workdir, environment=environment,
+            user=SANDBOX_USER,
+        )
+        return cls(exec_obj.start(detach=False))
+
+    async def _fill(self) -> None:
+        while True:
+            msg = await self._stream.read_out()
+            if msg is None:
+                raise EOFError('Judge runner exited')
+            # stderr самого супервизора в протокол не входит
+            if msg.stream == 1:
+                self._buffer.extend(msg.data)
+                return
+
+    async def _read_line(self) -> bytes:
+        while (newline := self._buffer.find(b'\n')) < 0:
+            await self._fill()
+        line = bytes(self._buffer[:newline])
+        del self._buffer[:newline + 1]
+        return line
+
+    async def _read_exactly(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            await self._fill()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def run(self, data: bytes) -> tuple[int, str, str]:
+        await self._stream.write_in(b'%d\n' % len(data) + data)
+        exit_code = int(await self._read_line())
+        stdout = await self._read_exactly(int(await self._read_line()))
+        stderr = await self._read_exactly(int(await self._read_line()))
+        return exit_code, stdout.decode('utf-8', errors='replace'), stderr.decode('utf-8', errors='replace')
+
+    async def close(self) -> None:
+        try:
+            await self._stream.close()
+        except Exception:  # noqa: BLE001
+            pass
 
 
 class DockerExecutor:
     """Выполняет код в изолированных Docker контейнерах"""
 
-    # Маппинг языков на Docker образы
+    # Маппинг языков на Docker образы (собираются из executor/images, тулчейны уже внутри)
     LANGUAGE_CONFIG = {
         'python': {
-            'image': 'python:3.12-slim',
+            'image': 'vibecode-python:latest',
             'main_file': 'main.py',
+            'judge_runner': 'python /opt/judge/judge_runner.py',
         },
         'typescript': {
-            'image': 'node:20-slim',
+            'image': 'vibecode-ts:latest',
             'main_file': 'main.ts',
-            'setup_command': 'npm install -g typescript ts-node',  # Предустановка для ускорения
+            'judge_runner': 'node /opt/judge/judge_runner.js',
         },
         'go': {
-            'image': 'golang:1.23-alpine',
+            'image': 'vibecode-go:latest',
             'main_file': 'main.go',
+            'judge_runner': '/bin/sh /opt/judge/judge_runner.sh',
+            # Короткие программы на тестах: без GC (с потолком памяти под лимит контейнера) и на одном P
+            'run_env': ['GOGC=off', 'GOMEMLIMIT=384MiB', 'GOMAXPROCS=1'],
         },
         'java': {
-            'image': 'openjdk:21-jdk-slim',
+            'image': 'vibecode-java:latest',
             'main_file': 'Main.java',
+            'judge_runner': '/bin/sh /opt/judge/judge_runner.sh',
         },
     }
 
+    # Расширение файла -> язык и обратно (для поиска главного файла)
+    _EXT_TO_LANG = {
+        '.py': 'python',
+        '.ts': 'typescript',
+        '.js': 'typescript',
+        '.go': 'go',
+        '.java': 'java',
+    }
+    _LANG_TO_EXT = {
+        'python': '.py',
+        'typescript': '.ts',
+        'go': '.go',
+        'java': '.java',
+    }
+
+    # Флаги JVM для запуска решений: CDS-архив образа (java -Xshare:dump) и SerialGC
+    # сокращают старт JVM, который на тестах платится на каждый запуск
+    JAVA_RUN_FLAGS = '-XX:+UseSerialGC -Xshare:auto -Xmx256m'
+
+    # Сколько тёплых контейнеров держать на язык
+    POOL_SIZE = 4
+
+    # Лимиты CPU песочницы: квота 50000 на период 100000 — половина ядра
+    CPU_PERIOD = 100000
+    CPU_QUOTA = 50000
+
+    # Потоки для блокирующей работы с файлами (rmtree, копирование артефактов)
+    IO_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
     def __init__(self):
-        self.client = docker.from_env()
-        self._thread_pool = ThreadPoolExecutor(max_workers=4)
-
-    async def _exec_in_container(self, container, command: str, timeout: int) -> tuple[int, str, str]:
-        """Выполнить команду внутри контейнера с таймаутом."""
-
-        def _run():
-            res = container.exec_run(command, demux=True)
-            exit_code = int(res.exit_code) if hasattr(res, 'exit_code') else int(res[0])
-            stdout_b, stderr_b = (res.output if hasattr(res, 'output') else res[1])
-            stdout = (stdout_b or b'').decode('utf-8', errors='replace')
-            stderr = (stderr_b or b'').decode('utf-8', errors='replace')
+        # aiohttp-сессия привязывается к запущенному event loop, поэтому клиент создаётся лениво
+        self._docker: aiodocker.Docker | None = None
+        # Пул долгоживущих контейнеров по языку: создание контейнера на каждый запуск
+        # (overlay, namespaces) стоит сотни миллисекунд, exec в готовом — единицы
+        self._pools: dict[str, asyncio.Queue] = {}
+        self._pool_sizes: dict[str, int] = {}
+        self._judge_archive: bytes | None = None
+        # id контейнера пула -> директория executor, смонтированная в нём как /workspace
+        self._bind_dirs: dict[str, str] = {}
+        # Отдельный ограниченный пул, чтобы файловые операции не делили default executor с чужими задачами
+        self._io_pool = ThreadPoolExecutor(max_workers=self.IO_WORKERS, thread_name_prefix='executor-io')
+        # LRU кэша артефактов: sha256 исходников -> директория с артефактами
+        self._artifact_cache: OrderedDict[str, str] = OrderedDict()
+        # Готовые HostConfig по (use_network, tmpfs_workspace): лимиты одинаковы для всех запусков.
+        # /workspace на tmpfs — в RAM, без copy-up OverlayFS на запись исходников и артефактов
+        # компиляции; put_archive в tmpfs не работает, поэтому файлы туда кладутся через exec.
+        self._host_configs: dict[tuple[bool, bool], dict[str, Any]] = {
+            (use_network, tmpfs_workspace): {
+                'Memory': 512 * 1024 * 1024,
+                'CpuPeriod': self.CPU_PERIOD,
+                'CpuQuota': self.CPU_QUOTA,
+                'NetworkMode': 'bridge' if use_network else 'none',
+                # docker-init подбирает осиротевшие процессы, PidsLimit не даёт fork-бомбе занять контейнер
+                'Init': True,
+                'PidsLimit': 256,
+                # mode=755: в /workspace пишет только root (распаковка файлов запуска), не код участника
+                **({'Tmpfs': {'/workspace': 'rw,exec,size=128m,mode=755'}} if tmpfs_workspace else {}),
+            }
+            for use_network in (False, True)
+            for tmpfs_workspace in (False, True)
+        }
+
+    @property
+    def docker(self) -> aiodocker.Docker:
+        if self._docker is None:
+            self._docker = aiodocker.Docker()
+        return self._docker
+
+    async def aclose(self) -> None:
+        for language, pool in self._pools.items():
+            while not pool.empty():
+                await self._discard_container(language, pool.get_nowait())
+        if self._docker is not None:
+            await self._docker.close()
+            self._docker = None
+        self._io_pool.shutdown(wait=False)
+
+    async def _run_io(self, func, *args):
+        """Выполнить блокирующую файловую операцию в пуле _io_pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._io_pool, func, *args)
+
+    def _pool(self, language: str) -> asyncio.Queue:
+        pool = self._pools.get(language)
+        if pool is None:
+            pool = self._pools[language] = asyncio.Queue()
+            self._pool_sizes[language] = 0
+        return pool
+
+    async def _spawn_pool_container(self, language: str):
+        """Создать и запустить простаивающий контейнер для пула"""
+        bind_dir = None
+        binds = None
+        if HOST_TMP_BASE:
+            slot = f'pool/{language}_{uuid.uuid4().hex[:12]}'
+            bind_dir = os.path.join(TMP_BASE, slot)
+            await self._run_io(functools.partial(os.makedirs, bind_dir, exist_ok=True))
+            binds = [f'{HOST_TMP_BASE.rstrip("/")}/{slot}:/workspace:rw']
+        config = self._container_config(
+            self.LANGUAGE_CONFIG[language]['image'],
+            '/bin/sh -c "sleep infinity"',
+            use_network=False,
+            tmpfs_workspace=binds is None,
+            binds=binds,
+        )
+        config['Labels'] = {'vibecode.executor.pool': language}
+        self._pool(language)
+        self._pool_sizes[language] += 1
+        try:
+            container = await self.docker.containers.create(config=config)
+            if bind_dir is not None:
+                self._bind_dirs[container.id] = bind_dir
+            await container.start()
+            # /opt лежит на обычном слое контейнера (не tmpfs), так что put_archive туда работает
+            await container.put_archive('/opt', self._get_judge_archive())
+        except Exception:
+            self._pool_sizes[language] -= 1
+            if bind_dir is not None:
+                await self._run_io(shutil.rmtree, bind_dir, True)
+            raise
+        return container
+
+    @staticmethod
+    def _judge_tarinfo(info: tarfile.TarInfo) -> tarfile.TarInfo | None:
+        """Файлы судейского цикла — root и только на чтение для SANDBOX_USER"""
+        if '__pycache__' in info.name:
+            return None
+        info.uid = info.gid = 0
+        info.uname = info.gname = 'root'
+        info.mode = 0o755 if info.isdir() else 0o644
+        return info
+
+    def _get_judge_archive(self) -> bytes:
+        """tar с супервизорами судейского цикла: собирается один раз на процесс"""
+        if self._judge_archive is None:
+            tar_stream = io.BytesIO()
+            with tarfile.open(fileobj=tar_stream, mode='w') as tar:
+                tar.add(JUDGE_SOURCE_DIR, arcname=os.path.basename(JUDGE_INSTALL_DIR), filter=self._judge_tarinfo)
+            self._judge_archive = tar_stream.getvalue()
+        return self._judge_archive
+
+    async def _ensure_images(self) -> None:
+        """Скачать отсутствующие локально образы песочниц"""
+        for config in self.LANGUAGE_CONFIG.values():
+            image = config['image']
+            try:
+                await self.docker.images.inspect(image)
+                continue
+            except aiodocker.exceptions.DockerError as exc:
+                if exc.status != 404:
+                    raise
+            try:
+                await self.docker.images.pull(image)
+            except aiodocker.exceptions.DockerError as exc:
+                # vibecode-* собираются локально (docker compose --profile sandbox build) и в registry может не быть
+                logger.warning('Sandbox image %s is missing and cannot be pulled: %s', image, exc)
+
+    async def _ensure_warm(self, language: str, n: int = POOL_SIZE) -> None:
+        """Догреть пул языка до n контейнеров"""
+        pool = self._pool(language)
+        missing = n - self._pool_sizes[language]
+        if missing <= 0:
+            return
+        containers = await asyncio.gather(
+            *(self._spawn_pool_container(language) for _ in range(missing)),
+            return_exceptions=True,
+        )
+        for container in containers:
+            if not isinstance(container, BaseException):
+                pool.put_nowait(container)
+
+    async def _discard_container(self, language: str, container) -> None:
+        self._pool_sizes[language] -= 1
+        try:
+            await container.delete(force=True)
+        except Exception:  # noqa: BLE001
+            pass
+        bind_dir = self._bind_dirs.pop(container.id, None)
+        if bind_dir is not None:
+            await self._run_io(shutil.rmtree, bind_dir, True)
+
+    async def _acquire_container(self, language: str):
+        """Взять контейнер из пула (или создать новый, если пул ещё не заполнен)"""
+        pool = self._pool(language)
+        while True:
+            if pool.empty() and self._pool_sizes[language] < self.POOL_SIZE:
+                return await self._spawn_pool_container(language)
+            container = await pool.get()
+            # Контейнер мог умереть, пока простаивал — проверяем перед выдачей
+            try:
+                health_exit, _, _ = await self._exec_in_container(container, 'true', timeout=5)
+            except Exception:  # noqa: BLE001
+                health_exit = -1
+            if health_exit == 0:
+                return container
+            await self._discard_container(language, container)
+
+    def _has_free_container(self, language: str) -> bool:
+        """Есть ли простаивающий контейнер или место для нового в пуле языка"""
+        return not self._pool(language).empty() or self._pool_sizes[language] < self.POOL_SIZE
+
+    async def _run_cold(self, image: str, command: str, tmpdir: str, timeout: int) -> tuple[int, str, str]:
+        """Разовый запуск через `docker run`: один процесс CLI вместо серии вызовов Engine API"""
+        # Демону нужен путь на хосте; без DOCKER_HOST_TMP_BASE executor работает прямо на хосте
+        host_dir = tmpdir if not HOST_TMP_BASE else os.path.join(HOST_TMP_BASE, os.path.relpath(tmpdir, TMP_BASE))
+        name = f'vibecode-cold-{uuid.uuid4().hex[:12]}'
+        argv = [
+            'docker', 'run', '--rm', '--name', name,
+            '--network', 'none',
+            '--memory', '512m',
+            '--cpu-period', str(self.CPU_PERIOD),
+            '--cpu-quota', str(self.CPU_QUOTA),
+            '-v', f'{host_dir}:/workspace:rw',
+            '-w', '/workspace',
+            image,
+            *shlex.split(command),
+        ]
+        proc = await asyncio.create_subprocess_exec(
+            *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except TimeoutError as exc:
+            # kill останавливает только CLI — сам контейнер удаляем отдельно
+            proc.kill()
+            await proc.wait()
+            rm = await asyncio.create_subprocess_exec(
+                'docker', 'rm', '-f', name,
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+            )
+            await rm.wait()
+            raise TimeoutError(f'Execution timeout after {timeout} seconds') from exc
+        return (
+            proc.returncode or 0,
+            stdout.decode('utf-8', errors='replace'),
+            stderr.decode('utf-8', errors='replace'),
+        )
+
+    async def _reset_container(self, container) -> bool:
+        """Убрать следы запуска перед возвратом в пул; False — контейнер надо выбросить.
+
+        Убивает все процессы SANDBOX_USER (в т.ч. оставленные в фоне), чистит общие для всех
+        записываемые директории и заново кладёт судейский цикл.
+        """
+        try:
+            # kill -1 от nobody шлёт сигнал всем процессам nobody, кроме самого shell; повтор — против fork в момент kill
+            await self._exec_in_container(
+                container, '/bin/sh -c "kill -9 -1; kill -9 -1; exit 0"', timeout=5, user=SANDBOX_USER
+            )
+            leftovers, _, _ = await self._exec_in_container(
+                container, f'/bin/sh -c {shlex.quote(_SANDBOX_CLEANUP_SCRIPT)}', timeout=10
+            )
+            if leftovers != 0:
+                return False
+            await container.put_archive('/opt', self._get_judge_archive())
+        except Exception:  # noqa: BLE001
+            return False
+        return True
+
+    async def _release_container(self, language: str, container, healthy: bool) -> None:
+        if healthy:
+            healthy = await self._reset_container(container)
+        if healthy:
+            self._pool(language).put_nowait(container)
+        else:
+            await self._discard_container(language, container)
+
+    @staticmethod
+    def _build_tar(tmpdir: str) -> bytes:
+        """tar с файлами верхнего уровня tmpdir (scandir отдаёт тип файла без отдельного stat)"""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode='w') as tar:
+            for entry in os.scandir(tmpdir):
+                if entry.is_file(follow_symlinks=False):
+                    tar.add(entry.path, arcname=entry.name)
+        return buffer.getvalue()
+
+    async def _stage_files(self, container, tmpdir: str) -> str:
+        """Скопировать файлы запуска в отдельную поддиректорию контейнера, вернуть её путь"""
+        run_id = uuid.uuid4().hex
+        workdir = f'/workspace/{run_id}'
+        bind_dir = self._bind_dirs.get(container.id)
+        if bind_dir is not None:
+            # /workspace — bind-mount директории на той же ФС, что и tmpdir: rename без копирования
+            os.rename(tmpdir, os.path.join(bind_dir, run_id))
+            return workdir
+        archive = self._build_tar(tmpdir)
+        # /workspace смонтирован как tmpfs, куда put_archive не пишет — распаковываем tar через stdin
+        tar_exit, _, tar_err = await self._exec_with_stdin(
+            container, f'/bin/sh -c "mkdir -p {workdir} && tar -x -C {workdir}"', archive, timeout=10
+        )
+        if tar_exit != 0:
+            raise RuntimeError(f'Failed to stage files: {tar_err}')
+        return workdir
+
+    async def _cleanup_workdir(self, container, workdir: str) -> bool:
+        """Удалить поддиректорию запуска; False — контейнер нельзя возвращать в пул"""
+        bind_dir = self._bind_dirs.get(container.id)
+        if bind_dir is not None:
+            try:
+                await self._run_io(shutil.rmtree, os.path.join(bind_dir, os.path.basename(workdir)))
+            except OSError:
+                return False
+            return True
+        try:
+            rm_exit, _, _ = await self._exec_in_container(container, f'rm -rf {workdir}', timeout=10)
+        except Exception:  # noqa: BLE001
+            return False
+        return rm_exit == 0
+
+    @staticmethod
+    def _artifact_key(language: str, files: dict[str, str]) -> str:
+        digest = hashlib.sha256(language.encode())
+        for path, content in sorted(files.items()):
+            digest.update(f'\0{path}\0{content}'.encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _copy_cached(cache_dir: str, tmpdir: str) -> bool:
+        try:
+            for name in os.listdir(cache_dir):
+                shutil.copy2(os.path.join(cache_dir, name), os.path.join(tmpdir, name))
+        except OSError:
+            return False
+        return True
+
+    async def _restore_artifacts(self, key: str, tmpdir: str) -> bool:
+        """Подложить закэшированные артефакты в tmpdir; True — компиляцию можно пропустить"""
+        cache_dir = self._artifact_cache.get(key)
+        if cache_dir is None:
+            return False
+        # Копирование — в пуле потоков, учёт LRU — в event loop
+        if not await self._run_io(self._copy_cached, cache_dir, tmpdir):
+            self._artifact_cache.pop(key, None)
+            return False
+        self._artifact_cache.move_to_end(key)
+        return True
+
+    @staticmethod
+    def _copy_artifacts(run_dir: str, cache_dir: str, suffixes: tuple[str, ...]) -> bool:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            for name in os.listdir(run_dir):
+                if name.endswith(suffixes):
+                    shutil.copy2(os.path.join(run_dir, name), os.path.join(cache_dir, name))
+        except OSError:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            return False
+        return True
+
+    @staticmethod
+    def _unpack_artifacts(archive: bytes, cache_dir: str) -> bool:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+                for member in tar:
+                    # Только файлы верхнего уровня: архив собран в контейнере, имена не доверяем
+                    if not member.isfile() or '/' in member.name or member.name in ('', '.', '..'):
+                        continue
+                    target = os.path.join(cache_dir, member.name)
+                    with tar.extractfile(member) as src, open(target, 'wb') as dst:
+                        shutil.copyfileobj(src, dst)
+                    os.chmod(target, member.mode & 0o755)
+        except (OSError, tarfile.TarError):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            return False
+        return True
+
+    async def _fetch_artifacts(self, container, workdir: str, language: str, cache_dir: str) -> bool:
+        """Забрать артефакты из tmpfs /workspace: get_archive её не видит, поэтому tar идёт через stdout exec"""
+        patterns = ' '.join(f'*{suffix}' if suffix.startswith('.') else suffix for suffix in ARTIFACT_SUFFIXES[language])
+        script = (
+            f'set --; for f in {patterns}; do [ -f "$f" ] && set -- "$@" "$f"; done; '
+            '[ $# -gt 0 ] || exit 1; tar -cf - "$@" | base64'
+        )
+        # stdout exec декодируется как текст, поэтому бинарный tar передаём в base64
+        exit_code, stdout, _ = await self._exec_in_container(
+            container, f'/bin/sh -c {shlex.quote(script)}', timeout=10, workdir=workdir
+        )
+        if exit_code != 0:
+            return False
+        try:
+            archive = base64.b64decode(stdout)
+        except binascii.Error:
+            return False
+        return await self._run_io(self._unpack_artifacts, archive, cache_dir)
+
+    async def _store_artifacts(self, key: str, language: str, container, workdir: str) -> None:
+        """Сохранить артефакты компиляции из рабочей директории запуска"""
+        cache_dir = os.path.join(ARTIFACT_CACHE_DIR, key)
+        bind_dir = self._bind_dirs.get(container.id)
+        try:
+            if bind_dir is not None:
+                # Копирование — в пуле потоков, учёт LRU — в event loop
+                run_dir = os.path.join(bind_dir, os.path.basename(workdir))
+                stored = await self._run_io(self._copy_artifacts, run_dir, cache_dir, ARTIFACT_SUFFIXES[language])
+            else:
+                stored = await self._fetch_artifacts(container, workdir, language, cache_dir)
+        except Exception as exc:  # noqa: BLE001
+            # Кэш — только оптимизация: ошибка сохранения не должна влиять на прогон
+            logger.warning('Failed to cache build artifacts: %s', exc)
+            stored = False
+        if not stored:
+            return
+        self._artifact_cache[key] = cache_dir
+        self._artifact_cache.move_to_end(key)
+        while len(self._artifact_cache) > ARTIFACT_CACHE_SIZE:
+            _, evicted = self._artifact_cache.popitem(last=False)
+            await self._run_io(shutil.rmtree, evicted, True)
+
+    async def _stage_and_compile(
+        self, container, language: str, files: dict[str, str], tmpdir: str, compile_command: str | None, timeout: int
+    ) -> tuple[str, int, str, str]:
+        """Положить файлы запуска в контейнер и скомпилировать (от root).
+
+        Повторная отправка того же решения не пересобирается: артефакты берутся из кэша.
+
+        Returns:
+            (workdir, exit_code, stdout, stderr) компиляции; без компиляции — (workdir, 0, '', '')
+        """
+        artifact_key = self._artifact_key(language, files) if compile_command else None
+        cached = artifact_key is not None and await self._restore_artifacts(artifact_key, tmpdir)
+        workdir = await self._stage_files(container, tmpdir)
+        if not compile_command or cached:
+            return workdir, 0, '', ''
+        exit_code, stdout, stderr = await self._exec_in_container(
+            container, compile_command, timeout=timeout, workdir=workdir
+        )
+        if exit_code == 0:
+            await self._store_artifacts(artifact_key, language, container, workdir)
+        return workdir, exit_code, stdout, stderr
+
+    def _container_config(
+        self,
+        image: str,
+        command: str,
+        use_network: bool,
+        tmpfs_workspace: bool = False,
+        binds: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Конфиг контейнера для Docker Engine API (аналог параметров docker-py containers.create)"""
+        # HostConfig общий для всех контейнеров с тем же (сеть, tmpfs); копируется только ради Binds
+        host_config = self._host_configs[(use_network, tmpfs_workspace)]
+        if binds:
+            host_config = {**host_config, 'Binds': binds}
+        return {
+            'Image': image,
+            'Cmd': shlex.split(command),
+            'WorkingDir': '/workspace',
+            'NetworkDisabled': not use_network,
+            'HostConfig': host_config,
+        }
+
+    async def _exec_in_container(
+        self, container, command: str, timeout: int, workdir: str | None = None, user: str = ''
+    ) -> tuple[int, str, str]:
+        """Выполнить команду внутри контейнера с таймаутом (user='' — пользователь образа, root)."""
+
+        async def _run():
+            exec_obj = await container.exec(cmd=command, stdout=True, stderr=True, workdir=workdir, user=user)
+            stdout_parts: list[bytes] = []
+            stderr_parts: list[bytes] = []
+            async with exec_obj.start(detach=False) as stream:
+                while True:
+                    msg = await stream.read_out()
+                    if msg is None:
+                        break
+                    (stdout_parts if msg.stream == 1 else stderr_parts).append(msg.data)
+            info = await exec_obj.inspect()
+            exit_code = int(info.get('ExitCode') or 0)
+            stdout = b''.join(stdout_parts).decode('utf-8', errors='replace')
+            stderr = b''.join(stderr_parts).decode('utf-8', errors='replace')
             return exit_code, stdout, stderr
 
-        return await asyncio.wait_for(asyncio.to_thread(_run), timeout=timeout)
+        return await asyncio.wait_for(_run(), timeout=timeout)
+
+    @staticmethod
+    def _stdin_command(command: str, size: int) -> list[str]:
+        """Команда, на stdin которой приходят ровно size байт, а затем EOF.
+
+        Полузакрыть сокет exec публичным API aiodocker нельзя (Stream.close() закрывает и чтение вывода),
+        поэтому EOF даёт head -c: прочитав size байт, он завершается и закрывает pipe.
+        """
+        return ['/bin/sh', '-c', 'n=$1; shift; head -c "$n" | "$@"', 'sh', str(size), *shlex.split(command)]
+
+    async def _exec_with_stdin(
+        self,
+        container,
+        command: str,
+        data: bytes,
+        timeout: int,
+        workdir: str | None = None,
+        environment: list[str] | None = None,
+        user: str = '',
+    ) -> tuple[int, str, str]:
+        """Выполнить команду, передав data в её stdin (с EOF после записи)."""
+
+        async def _run():
+            exec_obj = await container.exec(
+                cmd=self._stdin_command(command, len(data)), stdout=True, stderr=True, stdin=True, workdir=workdir, environment=environment,
+                user=user,
+            )
+            stdout_parts: list[bytes] = []
+            stderr_parts: list[bytes] = []
+            async with exec_obj.start(detach=False) as stream:
+                await stream.write_in(data)
+                while True:
+                    msg = await stream.read_out()
+                    if msg is None:
+                        break
+                    (stdout_parts if msg.stream == 1 else stderr_parts).append(msg.data)
+            info = await exec_obj.inspect()
+            exit_code = int(info.get('ExitCode') or 0)
+            stdout = b''.join(stdout_parts).decode('utf-8', errors='replace')
+            stderr = b''.join(stderr_parts).decode('utf-8', errors='replace')
+            return exit_code, stdout, stderr
+
+        return await asyncio.wait_for(_run(), timeout=timeout)
+
+    async def _run_tests(
+        self,
+        container,
+        judge_command: str,
+        runner_command: str,
+        workdir: str,
+        inputs: list[str],
+        timeout: int,
+        environment: list[str] | None = None,
+    ) -> tuple[list[tuple[int, str, str, int]], bool]:
+        """Прогнать тесты в одном контейнере несколькими параллельными судейскими циклами.
+
+        Returns:
+            ([(exit_code, stdout, stderr, duration_ms)] в порядке inputs, был ли таймаут)
+        """
+        results: list[tuple[int, str, str, int]] = [(-1, '', '', 0)] * len(inputs)
+        # Общий итератор: воркеры разбирают тесты по мере освобождения
+        pending = iter(range(len(inputs)))
+        timed_out = False
+
+        async def worker():
+            nonlocal timed_out
+            # Один процесс-супервизор на воркер: на каждый тест — только fork программы
+            # участника, без /bin/sh, base64 и нового exec через Docker API
+            judge = None
+            try:
+                judge = await _JudgeSession.start(container, judge_command, workdir, environment)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning('Judge runner unavailable, falling back to per-test exec: %s', exc)
+            try:
+                for idx in pending:
+                    data = inputs[idx].encode('utf-8')
+                    test_start_time = time.time()
+                    try:
+                        if judge is not None:
+                            try:
+                                result = await asyncio.wait_for(judge.run(data), timeout=timeout)
+                            except TimeoutError:
+                                raise
+                            except Exception as exc:  # noqa: BLE001
+                                # Супервизор умер или нарушил протокол — дальше по одному exec на тест
+                                logger.warning('Judge runner failed, falling back to per-test exec: %s', exc)
+                                await judge.close()
+                                judge = None
+                        if judge is None:
+                            # Вход пишется прямо в stdin программы — без /bin/sh, echo и base64
+                            result = await self._exec_with_stdin(
+                                container, runner_command, data, timeout=timeout, workdir=workdir,
+                                environment=environment, user=SANDBOX_USER,
+                            )
+                    except TimeoutError:
+                        # Зависший процесс остаётся в контейнере — после прогона контейнер выбрасываем.
+                        # Ответ супервизора на этот тест ещё придёт, поэтому его поток больше не читаем.
+                        timed_out = True
+                        result = (-1, '', f'Execution timeout after {timeout} seconds')
+                        if judge is not None:
+                            await judge.close()
+                            judge = None
+                    results[idx] = (*result, int((time.time() - test_start_time) * 1000))
+            finally:
+                if judge is not None:
+                    await judge.close()
+
+        # Одновременных прогонов — по числу половин CPU из квоты контейнера, но не меньше двух
+        workers = min(len(inputs), max(2, self.CPU_QUOTA // 50000))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results, timed_out
 
     def _detect_language_from_file(self, filepath: str) -> str | None:
         """Определить язык по расширению файла"""
-        ext = os.path.splitext(filepath)[1].lower()
-        ext_map = {
-            '.py': 'python',
-            '.ts': 'typescript',
-            '.js': 'typescript',  
-            '.go': 'go',
-            '.java': 'java',
-        }
-        return ext_map.get(ext)
+        return self._EXT_TO_LANG.get(os.path.splitext(filepath)[1].lower())
 
     async def execute_code(
         self, language: str, files: dict[str, str], timeout: int = 30, test_cases: list | None = None
@@ -85,61 +766,56 @@ class DockerExecutor:
 
         # Создаем временную директорию
         # Используем /app/tmp внутри executor контейнера для совместимости с Docker-in-Docker
-        tmp_base = '/app/tmp'
+        tmp_base = TMP_BASE
         os.makedirs(tmp_base, exist_ok=True)
         # Генерируем уникальное имя для volume
-        import uuid
         volume_name = f"executor_run_{uuid.uuid4().hex[:12]}"
         tmpdir = os.path.join(tmp_base, volume_name)
         os.makedirs(tmpdir, exist_ok=True)
         try:
             # Записываем файлы
-            print(f"📁 Received files: {list(files.keys())}")
+            # Отладочный вывод форматируется только при включённом DEBUG — на горячем пути он не нужен
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug('Received files: %s', list(files))
+            # Файлов обычно единицы, поэтому пишем синхронно, но makedirs — один раз на директорию
+            seen_dirs = {tmpdir}
             for filepath, content in files.items():
                 full_path = os.path.join(tmpdir, filepath)
-                print(f"📝 Writing file: {filepath} -> {full_path}")
-                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                parent = os.path.dirname(full_path)
+                if parent not in seen_dirs:
+                    os.makedirs(parent, exist_ok=True)
+                    seen_dirs.add(parent)
                 with open(full_path, 'w', encoding='utf-8') as f:
                     f.write(content)
-                print(f"✅ File written: {full_path} (exists: {os.path.exists(full_path)})")
+                if debug:
+                    logger.debug('File written: %s -> %s', filepath, full_path)
 
             # Определяем язык по расширению файла (приоритет над переданным языком)
             detected_language = None
             main_file_path = None
             
-            # Находим главный файл и определяем язык
-            # Приоритет: файлы с расширением языка программирования
-            for filepath in files.keys():
+            # Находим главный файл и определяем язык за один проход.
+            # Приоритет: файлы с расширением языка программирования, затем файл
+            # с расширением переданного языка, затем первый файл.
+            fallback_path = None
+            target_ext = self._LANG_TO_EXT.get(language, '.py')
+            for filepath in files:
                 file_lang = self._detect_language_from_file(filepath)
                 if file_lang:
                     detected_language = file_lang
                     main_file_path = filepath
                     break
-            
+                if fallback_path is None and filepath.endswith(target_ext):
+                    fallback_path = filepath
+
             # Если не определили по расширению, используем переданный язык
             if not detected_language:
                 detected_language = language
+                main_file_path = fallback_path or next(iter(files))
             
-            # Если не нашли главный файл, ищем любой файл с нужным расширением
-            if not main_file_path:
-                ext_map = {
-                    'python': '.py',
-                    'typescript': '.ts',
-                    'go': '.go',
-                    'java': '.java',
-                }
-                target_ext = ext_map.get(detected_language, '.py')
-                for filepath in files.keys():
-                    if filepath.endswith(target_ext):
-                        main_file_path = filepath
-                        break
-            
-            # Если всё ещё не нашли, берём первый файл
-            if not main_file_path:
-                main_file_path = list(files.keys())[0]
-            
-            print(f"🔍 Detected language: {detected_language}")
-            print(f"📄 Main file path: {main_file_path}")
+            if debug:
+                logger.debug('Detected language: %s, main file: %s', detected_language, main_file_path)
 
             # Проверяем, поддерживается ли язык
             if detected_language not in self.LANGUAGE_CONFIG:
@@ -154,167 +830,109 @@ class DockerExecutor:
                 # Используем tsc для компиляции всех .ts файлов
                 js_file = main_file_path.replace('.ts', '.js')
                 # Компилируем все .ts файлы в текущей директории и запускаем главный
-                # npx -y tsc скачает и запустит TypeScript компилятор
-                command = f'/bin/sh -c "cd /workspace && npx -y tsc --target ES2020 --module commonjs --esModuleInterop --skipLibCheck *.ts 2>&1 && node {js_file}"'
+                # tsc предустановлен в образе vibecode-ts, сеть для компиляции не нужна
+                command = f'/bin/sh -c "tsc --target ES2020 --module commonjs --esModuleInterop --skipLibCheck *.ts 2>&1 && node {js_file}"'
             elif language == 'java':
                 # Для Java нужно скомпилировать
                 class_name = os.path.splitext(os.path.basename(main_file_path))[0]
-                command = f'/bin/sh -c "cd /workspace && javac {main_file_path} && java {class_name}"'
+                command = f'/bin/sh -c "javac {main_file_path} && java {self.JAVA_RUN_FLAGS} {class_name}"'
             elif language == 'go':
-                command = f'go run /workspace/{main_file_path}'
+                command = f'go run {main_file_path}'
             else:
                 # Python
-                command = f'python /workspace/{main_file_path}'
+                command = f'python {main_file_path}'
+            # command — для разового контейнера (_run_cold), который после запуска удаляется
             
-            print(f"🐳 Docker command: {command}")
-            print(f"📂 tmpdir: {tmpdir}")
-            print(f"📂 tmpdir is absolute: {os.path.isabs(tmpdir)}")
-            print(f"📂 tmpdir exists: {os.path.exists(tmpdir)}")
-            print(f"📂 Files in tmpdir: {os.listdir(tmpdir)}")
-            for f in os.listdir(tmpdir):
-                full = os.path.join(tmpdir, f)
-                print(f"   - {f}: size={os.path.getsize(full)} bytes")
+            if debug:
+                logger.debug('Docker command: %s', command)
+                logger.debug('tmpdir: %s', tmpdir)
+                for f in os.listdir(tmpdir):
+                    logger.debug('   - %s: size=%d bytes', f, os.path.getsize(os.path.join(tmpdir, f)))
 
-            runner_command = None
+            # В тёплом контейнере компиляция (от root) и запуск (от SANDBOX_USER) — отдельные exec
+            if language == 'typescript':
+                compile_command = '/bin/sh -lc "tsc --target ES2020 --module commonjs --esModuleInterop --skipLibCheck *.ts"'
+                runner_command = f"node {main_file_path.replace('.ts', '.js')}"
+            elif language == 'java':
+                # -proc:none: компиляция идёт от root — annotation processors из workdir не загружаем
+                compile_command = f'/bin/sh -lc "javac -proc:none {main_file_path}"'
+                class_name = os.path.splitext(os.path.basename(main_file_path))[0]
+                runner_command = f"java {self.JAVA_RUN_FLAGS} {class_name}"
+            elif language == 'go':
+                compile_command = f'/bin/sh -lc "go build -o main_bin {main_file_path}"'
+                runner_command = "./main_bin"
+            else:
+                compile_command = None
+                runner_command = f"python {main_file_path}"
 
             if not test_cases:
-                # Запускаем контейнер напрямую только если нет набора тестов.
+                # Запускаем код напрямую только если нет набора тестов.
                 container = None
+                healthy = False
                 try:
-                    use_network = language == 'typescript'
-                    # Создаем контейнер без запуска
-                    container = self.client.containers.create(
-                        image=config['image'],
-                        command=command,
-                        mem_limit='512m',
-                        cpu_period=100000,
-                        cpu_quota=50000,
-                        network_disabled=not use_network,
-                        working_dir='/workspace',
-                        environment={'NPM_CONFIG_CACHE': '/tmp/.npm'} if use_network else None,
-                    )
-                    
-                    # Копируем файлы в контейнер
-                    import tarfile
-                    import io
-                    tar_stream = io.BytesIO()
-                    with tarfile.open(fileobj=tar_stream, mode='w') as tar:
-                        for filename in os.listdir(tmpdir):
-                            filepath = os.path.join(tmpdir, filename)
-                            if os.path.isfile(filepath):
-                                tar.add(filepath, arcname=filename)
-                    tar_stream.seek(0)
-                    container.put_archive('/workspace', tar_stream)
-                    
-                    # Запускаем контейнер
-                    container.start()
-                    try:
-                        container.wait(timeout=timeout)
-                    except Exception as wait_exc:  # noqa: BLE001
-                        container.stop(timeout=1)
-                        raise TimeoutError(f'Execution timeout after {timeout} seconds') from wait_exc
-
-                    stdout_bytes = container.logs(stdout=True, stderr=False)
-                    stderr_bytes = container.logs(stdout=False, stderr=True)
-                    container.reload()
-                    exit_code = container.attrs['State']['ExitCode'] or 0
-                    stdout = stdout_bytes.decode('utf-8', errors='replace') if stdout_bytes else ''
-                    stderr_raw = stderr_bytes.decode('utf-8', errors='replace') if stderr_bytes else ''
+                    if self._has_free_container(language):
+                        container = await self._acquire_container(language)
+                        try:
+                            workdir, exit_code, stdout, stderr_raw = await self._stage_and_compile(
+                                container, language, files, tmpdir, compile_command, timeout
+                            )
+                            if exit_code == 0:
+                                exit_code, stdout, stderr_raw = await self._exec_in_container(
+                                    container, runner_command, timeout=timeout, workdir=workdir, user=SANDBOX_USER
+                                )
+                        except TimeoutError as exc:
+                            # Процесс продолжает работать внутри — такой контейнер в пул не возвращаем
+                            raise TimeoutError(f'Execution timeout after {timeout} seconds') from exc
+                        healthy = await self._cleanup_workdir(container, workdir)
+                    else:
+                        # Пул занят целиком — не ждём освобождения, а запускаем разовый контейнер
+                        exit_code, stdout, stderr_raw = await self._run_cold(config['image'], command, tmpdir, timeout)
                     stderr = stderr_raw if exit_code != 0 and stderr_raw.strip() else ''
                 except TimeoutError as exc:
                     stdout = ''
                     stderr = str(exc)
                     exit_code = -1
-                except docker.errors.ContainerError as exc:
-                    stdout = exc.stdout.decode('utf-8', errors='replace') if exc.stdout else ''
-                    stderr = exc.stderr.decode('utf-8', errors='replace') if exc.stderr else str(exc)
-                    exit_code = exc.exit_status
                 except Exception as exc:  # noqa: BLE001
                     stdout = ''
                     stderr = f'Docker error: {str(exc)}'
                     exit_code = -1
                 finally:
-                    try:
-                        if container:
-                            container.remove(force=True)
-                    except Exception:  # noqa: BLE001
-                        pass
+                    if container:
+                        await self._release_container(language, container, healthy)
 
             # Если есть тесты, выполняем их в ОДНОМ контейнере (вместо контейнера на каждый тест)
             test_results = []
             if test_cases:
                 container = None
+                healthy = False
                 first_error_output = ''
                 try:
-                    use_network = language == 'typescript'
-                    container = self.client.containers.create(
-                        image=config['image'],
-                        command='/bin/sh -c "sleep 3600"',
-                        mem_limit='512m',
-                        cpu_period=100000,
-                        cpu_quota=50000,
-                        network_disabled=not use_network,
-                        working_dir='/workspace',
-                        environment={'NPM_CONFIG_CACHE': '/tmp/.npm'} if use_network else None,
+                    container = await self._acquire_container(language)
+
+                    workdir, _, _, _ = await self._stage_and_compile(
+                        container, language, files, tmpdir, compile_command, timeout
                     )
-                    container.start()
-
-                    import tarfile
-                    import io
-                    tar_stream = io.BytesIO()
-                    with tarfile.open(fileobj=tar_stream, mode='w') as tar:
-                        for filename in os.listdir(tmpdir):
-                            filepath = os.path.join(tmpdir, filename)
-                            if os.path.isfile(filepath):
-                                tar.add(filepath, arcname=filename)
-                    tar_stream.seek(0)
-                    container.put_archive('/workspace', tar_stream)
-
-                    # Подготовка (компиляция) один раз
-                    if language == 'typescript':
-                        await self._exec_in_container(
-                            container,
-                            '/bin/sh -lc "cd /workspace && npx -y tsc --target ES2020 --module commonjs --esModuleInterop --skipLibCheck *.ts"',
-                            timeout=timeout,
-                        )
-                        runner_command = f"node {main_file_path.replace('.ts', '.js')}"
-                    elif language == 'java':
-                        await self._exec_in_container(
-                            container,
-                            f'/bin/sh -lc "cd /workspace && javac {main_file_path}"',
-                            timeout=timeout,
-                        )
-                        class_name = os.path.splitext(os.path.basename(main_file_path))[0]
-                        runner_command = f"java {class_name}"
-                    elif language == 'go':
-                        await self._exec_in_container(
-                            container,
-                            f'/bin/sh -lc "cd /workspace && go build -o main_bin {main_file_path}"',
-                            timeout=timeout,
-                        )
-                        runner_command = "./main_bin"
-                    else:
-                        runner_command = f"python {main_file_path}"
 
-                    for test_idx, test_case in enumerate(test_cases):
+                    cases = []
+                    for test_case in test_cases:
                         if isinstance(test_case, dict):
-                            test_input = test_case.get('input', '')
-                            expected_output = test_case.get('output', '').strip()
+                            cases.append((test_case.get('input', ''), test_case.get('output', '').strip()))
                         else:
-                            test_input = test_case.input
-                            expected_output = test_case.output.strip()
-
-                        test_start_time = time.time()
-                        b64 = base64.b64encode((test_input or '').encode('utf-8')).decode('ascii')
-                        cmd = f'/bin/sh -lc "cd /workspace && echo {b64} | base64 -d | {runner_command}"'
-                        try:
-                            t_exit, t_out, t_err = await self._exec_in_container(container, cmd, timeout=timeout)
-                        except TimeoutError:
-                            t_exit, t_out, t_err = -1, '', f'Execution timeout after {timeout} seconds'
-                        except asyncio.TimeoutError:
-                            t_exit, t_out, t_err = -1, '', f'Execution timeout after {timeout} seconds'
+                            cases.append((test_case.input, test_case.output.strip()))
+
+                    runs, timed_out = await self._run_tests(
+                        container,
+                        f"{config['judge_runner']} {runner_command}",
+                        runner_command,
+                        workdir,
+                        [test_input or '' for test_input, _ in cases],
+                        timeout,
+                        config.get('run_env'),
+                    )
 
-                        test_duration_ms = int((time.time() - test_start_time) * 1000)
+                    for test_idx, ((test_input, expected_output), (t_exit, t_out, t_err, test_duration_ms)) in enumerate(
+                        zip(cases, runs)
+                    ):
                         actual_output = (t_out or '').strip()
                         passed = (t_exit == 0) and (actual_output == expected_output)
 
@@ -352,12 +970,10 @@ class DockerExecutor:
                     if not all_passed and first_error_output:
                         stderr = first_error_output
                     exit_code = 0 if all_passed else 1
+                    healthy = not timed_out and await self._cleanup_workdir(container, workdir)
                 finally:
-                    try:
-                        if container:
-                            container.remove(force=True)
-                    except Exception:  # noqa: BLE001
-                        pass
+                    if container:
+                        await self._release_container(language, container, healthy)
             else:
                 verdict = None
                 test_results = None
@@ -372,195 +988,5 @@ class DockerExecutor:
             }
         finally:
             # Cleanup temporary directory
-            import shutil
             if os.path.exists(tmpdir):
-                shutil.rmtree(tmpdir, ignore_errors=True)
-
-    async def _run_test(
-        self,
-        language: str,
-        main_file_path: str,
-        tmpdir: str,
-        test_input: str,
-        timeout: int,
-        runner_command: str | None = None,
-    ) -> dict[str, Any]:
-        """Запустить код на одном тесте"""
-        config = self.LANGUAGE_CONFIG[language]
-        
-        # Записываем входные данные во временный файл для надежной передачи
-        input_file_path = os.path.join(tmpdir, 'test_input.txt')
-        # Убеждаемся, что входные данные не пустые и правильно записаны
-        test_input_normalized = test_input if test_input else ''
-        with open(input_file_path, 'w', encoding='utf-8') as f:
-            f.write(test_input_normalized)
-        
-        # Проверяем, что файл создан
-        if not os.path.exists(input_file_path):
-            return {
-                'stdout': '',
-                'stderr': 'Failed to create input file',
-                'exit_code': -1,
-            }
-        
-        # Определяем команду запуска с перенаправлением из файла
-        # working_dir = /workspace, используем абсолютные пути
-        if runner_command:
-            command = f'/bin/sh -c "cd /workspace && cat test_input.txt | {runner_command}"'
-        else:
-            if language == 'typescript':
-                js_file = main_file_path.replace('.ts', '.js')
-                command = f'/bin/sh -c "cd /workspace && npx -y tsc --target ES2020 --module commonjs --esModuleInterop --skipLibCheck *.ts 2>&1 && cat test_input.txt | node {js_file}"'
-            elif language == 'java':
-                class_name = os.path.splitext(os.path.basename(main_file_path))[0]
-                command = f'/bin/sh -c "cd /workspace && cat test_input.txt | java {class_name}"'
-            elif language == 'go':
-                command = f'/bin/sh -c "cd /workspace && cat test_input.txt | go run {main_file_path}"'
-            else:
-                # Python  
-                command = f'sh -c "cd /workspace && cat test_input.txt | python {main_file_path}"'
-            
-        print(f"🐳 Test command: {command}")
-        
-        container = None
-        try:
-            use_network = language == 'typescript'
-            # Создаем контейнер без запуска
-            container = self.client.containers.create(
-                image=config['image'],
-                command=command,
-                mem_limit='512m',
-                cpu_period=100000,
-                cpu_quota=50000,
-                network_disabled=not use_network,
-                working_dir='/workspace',
-                environment={'NPM_CONFIG_CACHE': '/tmp/.npm'} if use_network else None,
-            )
-            
-            # Копируем файлы в контейнер
-            import tarfile
-            import io
-            tar_stream = io.BytesIO()
-            with tarfile.open(fileobj=tar_stream, mode='w') as tar:
-                for filename in os.listdir(tmpdir):
-                    filepath = os.path.join(tmpdir, filename)
-                    if os.path.isfile(filepath):
-                        tar.add(filepath, arcname=filename)
-            tar_stream.seek(0)
-            container.put_archive('/workspace', tar_stream)
-            
-            # Запускаем контейнер
-            container.start()
-            container.wait(timeout=timeout)
-            
-            stdout_bytes = container.logs(stdout=True, stderr=False)
-            stderr_bytes = container.logs(stdout=False, stderr=True)
-            
-            container.reload()
-            exit_code = container.attrs['State']['ExitCode'] or 0
-            
-            stdout = stdout_bytes.decode('utf-8', errors='replace') if stdout_bytes else ''
-            # Показываем stderr только если есть реальная ошибка (exit_code != 0)
-            # Игнорируем предупреждения компилятора и другие несущественные сообщения
-            stderr_raw = stderr_bytes.decode('utf-8', errors='replace') if stderr_bytes else ''
-            stderr = stderr_raw if exit_code != 0 and stderr_raw.strip() else ''
-            
-        except Exception as exc:  # noqa: BLE001
-            stdout = ''
-            stderr = str(exc)
-            exit_code = -1
-        finally:
-            try:
-                if container:
-                    container.remove(force=True)
-            except Exception:  # noqa: BLE001
-                pass
-        
-        return {
-            'stdout': stdout,
-            'stderr': stderr,
-            'exit_code': exit_code,
-        }
-
-    def _prepare_runner(
-        self,
-        language: str,
-        main_file_path: str,
-        tmpdir: str,
-        timeout: int,
-    ) -> str:
-        """
-        Предварительно компилирует/подготавливает окружение и возвращает команду запуска
-        без учёта передачи входных данных (stdin подключается отдельно).
-        """
-        config = self.LANGUAGE_CONFIG[language]
-        use_network = language == 'typescript'
-        compile_container = None
-
-        def run_compile(command: str):
-            nonlocal compile_container
-            try:
-                # Создаем контейнер без запуска
-                compile_container = self.client.containers.create(
-                    image=config['image'],
-                    command=command,
-                    mem_limit='512m',
-                    cpu_period=100000,
-                    cpu_quota=50000,
-                    network_disabled=not use_network,
-                    working_dir='/workspace',
-                    environment={'NPM_CONFIG_CACHE': '/tmp/.npm'} if use_network else None,
-                )
-                
-                # Копируем файлы в контейнер
-                import tarfile
-                import io
-                tar_stream = io.BytesIO()
-                with tarfile.open(fileobj=tar_stream, mode='w') as tar:
-                    for filename in os.listdir(tmpdir):
-                        filepath = os.path.join(tmpdir, filename)
-                        if os.path.isfile(filepath):
-                            tar.add(filepath, arcname=filename)
-                tar_stream.seek(0)
-                compile_container.put_archive('/workspace', tar_stream)
-                
-                # Запускаем контейнер
-                compile_container.start()
-                compile_container.wait(timeout=timeout)
-            except Exception as exc:  # noqa: BLE001
-                logs = ''
-                if compile_container:
-                    try:
-                        logs_bytes = compile_container.logs(stdout=True, stderr=True)
-                        logs = logs_bytes.decode('utf-8', errors='replace')
-                    except Exception:  # noqa: BLE001
-                        logs = ''
-                raise RuntimeError(f'Failed to prepare {language} environment: {exc}\n{logs}') from exc
-            finally:
-                try:
-                    if compile_container:
-                        compile_container.remove(force=True)
-                except Exception:  # noqa: BLE001
-                    pass
-
-        if language == 'typescript':
-            js_file = main_file_path.replace('.ts', '.js')
-            compile_cmd = '/bin/sh -c "cd /workspace && npx -y tsc --target ES2020 --module commonjs --esModuleInterop --skipLibCheck *.ts"'
-            run_compile(compile_cmd)
-            return f'node {js_file}'
-
-        if language == 'go':
-            binary_name = 'main_bin'
-            compile_cmd = f'/bin/sh -c "cd /workspace && go build -o {binary_name} {main_file_path}"'
-            run_compile(compile_cmd)
-            return f'./{binary_name}'
-
-        if language == 'java':
-            class_name = os.path.splitext(os.path.basename(main_file_path))[0]
-            compile_cmd = f'/bin/sh -c "cd /workspace && javac {main_file_path}"'
-            run_compile(compile_cmd)
-            return f'java {class_name}'
-
-        # Python и прочее без подготовки
-        return f'python {main_file_path}'
-
+                await self._run_io(shutil.rmtree, tmpdir, True)
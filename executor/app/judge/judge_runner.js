@@ -0,0 +1,34 @@
+'use strict';
+// Судейский цикл: запускает программу участника на каждом тесте из stdin.
+//
+// Протокол (stdin):  <len>\n<input bytes>
+// Протокол (stdout): <exit>\n<len>\n<stdout bytes><len>\n<stderr bytes>
+// Команда программы передаётся аргументами: node judge_runner.js node main.js
+
+const { spawnSync } = require('child_process');
+
+const [command, ...args] = process.argv.slice(2);
+let buffer = Buffer.alloc(0);
+
+process.stdin.on('data', (chunk) => {
+  buffer = Buffer.concat([buffer, chunk]);
+  for (;;) {
+    const newline = buffer.indexOf(10);
+    if (newline < 0) return;
+    const length = parseInt(buffer.subarray(0, newline).toString(), 10);
+    if (buffer.length < newline + 1 + length) return;
+    const input = buffer.subarray(newline + 1, newline + 1 + length);
+    buffer = buffer.subarray(newline + 1 + length);
+
+    const result = spawnSync(command, args, { input, maxBuffer: 64 * 1024 * 1024 });
+    const stdout = result.stdout || Buffer.alloc(0);
+    const stderr = result.stderr || Buffer.from(result.error ? String(result.error) : '');
+    const exitCode = result.status === null ? -1 : result.status;
+    process.stdout.write(Buffer.concat([
+      Buffer.from(`${exitCode}\n${stdout.length}\n`),
+      stdout,
+      Buffer.from(`${stderr.length}\n`),
+      stderr,
+    ]));
+  }
+});
@@ -0,0 +1,30 @@
+"""Судейский цикл: запускает программу участника на каждом тесте из stdin.
+
+Протокол (stdin):  <len>\n<input bytes>
+Протокол (stdout): <exit>\n<len>\n<stdout bytes><len>\n<stderr bytes>
+Команда программы передаётся аргументами: python judge_runner.py python main.py
+"""
+
+import subprocess
+import sys
+
+
+def main() -> None:
+    command = sys.argv[1:]
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    while True:
+        header = stdin.readline()
+        if not header:
+            break
+        data = stdin.read(int(header))
+        proc = subprocess.run(command, input=data, capture_output=True)
+        stdout.write(b'%d\n%d\n' % (proc.returncode, len(proc.stdout)))
+        stdout.write(proc.stdout)
+        stdout.write(b'%d\n' % len(proc.stderr))
+        stdout.write(proc.stderr)
+        stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+#!/bin/sh
+# Судейский цикл: запускает программу участника на каждом тесте из stdin.
+#
+# Протокол (stdin):  <len>\n<input bytes>
+# Протокол (stdout): <exit>\n<len>\n<stdout bytes><len>\n<stderr bytes>
+# Команда программы передаётся аргументами: sh judge_runner.sh java Main
+
+tmp=$(mktemp -d)
+trap 'rm -rf "$tmp"' EXIT
+
+while IFS= read -r length; do
+  head -c "$length" > "$tmp/in"
+  "$@" < "$tmp/in" > "$tmp/out" 2> "$tmp/err"
+  code=$?
+  printf '%s\n%s\n' "$code" "$(wc -c < "$tmp/out")"
+  cat "$tmp/out"
+  printf '%s\n' "$(wc -c < "$tmp/err")"
+  cat "$tmp/err"
+done
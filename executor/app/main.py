@@ -1,7 +1,9 @@
 """Executor Service - Микросервис для выполнения кода в Docker"""
 
 import asyncio
+import logging
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 import httpx
@@ -10,14 +12,33 @@ from pydantic import BaseModel, Field
 
 from .docker_executor import DockerExecutor
 
-app = FastAPI(title='VibeCode Executor Service')
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
+logger = logging.getLogger(__name__)
 
 # URL основного backend для callback
 BACKEND_URL = os.getenv('BACKEND_URL', 'http://localhost:8000/api')
 
+# Сколько контейнеров каждого языка поднять до приёма первых запросов
+WARM_ON_STARTUP = {'python': 2, 'typescript': 1, 'go': 1, 'java': 1}
+
 executor = DockerExecutor()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pull образов и холодный старт контейнеров — до первого запроса, а не в нём
+    try:
+        await executor._ensure_images()
+        await asyncio.gather(*(executor._ensure_warm(language, n) for language, n in WARM_ON_STARTUP.items()))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning('Sandbox warm-up failed, containers will be created on demand: %s', exc)
+    yield
+    await executor.aclose()
+
+
+app = FastAPI(title='VibeCode Executor Service', lifespan=lifespan)
+
+
 class TestCase(BaseModel):
     input: str
     output: str
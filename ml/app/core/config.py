@@ -1,4 +1,6 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     """Настройки приложения"""
@@ -12,8 +14,31 @@ class Settings(BaseSettings):
     MODEL_AWQ: str = "llama-3.3-70b-versatile"
     MODEL_CODER: str = "llama-3.3-70b-versatile"
     
-    class Config:
-        case_sensitive = True
-        env_file = ".env"
+    LOG_LEVEL: str = "INFO"
+    
+    # Кэш ответов LLM: только для детерминированных запросов (temperature <= порога)
+    LLM_CACHE_PATH: str = ".cache/llm_responses.sqlite3"
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_ROWS: int = 10_000
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.3
+    
+    # hard: выходы тестов от LLM запрашиваются параллельно с запуском эталона (лишний запрос ради латентности)
+    SPECULATIVE_TEST_OUTPUTS: bool = True
+    
+    # Сервис вызывается backend'ом; из браузера — только с фронтенда (JSON-список в env)
+    CORS_ORIGINS: list[str] = ["http://localhost:5173", "http://127.0.0.1:5173", "http://localhost:3000"]
+    
+    # frozen: настройки читаются один раз при старте и дальше не меняются
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        frozen=True,
+        extra="ignore",
+    )
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Singleton настроек: .env читается и валидируется один раз (в тестах — get_settings.cache_clear())."""
+    return Settings()
 
-settings = Settings()
+settings = get_settings()
@@ -14,6 +14,7 @@ from app.services.communication import communication_service
 from app.services.scoring import scoring_service
 from app.services.anti_cheat import anti_cheat_service
 from app.services.hint_service import hint_service
+from app.services.response_cache import response_cache
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -23,6 +24,15 @@ class AntiCheatRequest(BaseModel):
     code: str
     problem_description: str
 
+@router.get("/llm-cache/stats")
+async def llm_cache_stats():
+    """Попадания и промахи кэша ответов LLM с момента старта сервиса.
+    
+    Returns:
+        dict: hits, misses, hit_rate
+    """
+    return response_cache.stats()
+
 @router.post("/generate-task", response_model=Task)
 async def generate_task(request: TaskGenerationRequest):
     """Генерирует новую задачу.
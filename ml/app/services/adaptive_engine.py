@@ -3,6 +3,22 @@ from app.models.schemas import AdaptiveLevelRequest, AdaptiveLevelResponse
 
 class AdaptiveDifficultyEngine:
     """Адаптивный движок для определения следующего уровня сложности."""
+
+    # (текущий уровень, пройдено, плохих попыток >= 2) -> (следующий уровень, причина)
+    _TRANSITIONS: dict[tuple[str, bool, bool], tuple[str, str]] = {
+        ("medium", True, True): ("medium", "Пройдено, но с множественными ошибками. Закрепляем Medium."),
+        ("medium", True, False): ("hard", "Пройдено Medium успешно. Повышаем до Hard."),
+        ("medium", False, True): ("easy", "Провал Medium. Понижаем до Easy для практики."),
+        ("medium", False, False): ("easy", "Провал Medium. Понижаем до Easy для практики."),
+        ("easy", True, True): ("medium", "Пройдено Easy. Повышаем до Medium."),
+        ("easy", True, False): ("medium", "Пройдено Easy. Повышаем до Medium."),
+        ("easy", False, True): ("easy", "Провал Easy. Повторяем Easy."),
+        ("easy", False, False): ("easy", "Провал Easy. Повторяем Easy."),
+        ("hard", True, True): ("hard", "Пройдено Hard. Отлично! Сохраняем сложный уровень."),
+        ("hard", True, False): ("hard", "Пройдено Hard. Отлично! Сохраняем сложный уровень."),
+        ("hard", False, True): ("medium", "Провал Hard. Понижаем до Medium."),
+        ("hard", False, False): ("medium", "Провал Hard. Понижаем до Medium."),
+    }
     
     def determine_next_level(self, request: AdaptiveLevelRequest) -> AdaptiveLevelResponse:
         """Определяет следующий уровень сложности на основе результатов.
@@ -13,41 +29,8 @@ class AdaptiveDifficultyEngine:
         Returns:
             AdaptiveLevelResponse: Следующий уровень и причина выбора
         """
-        current = request.current_difficulty
-        passed = request.is_passed
-        bad_attempts = request.bad_attempts
-        
-        next_level = current
-        reason = "Уровень сохранён."
-
-        if current == "medium":
-            if passed:
-                if bad_attempts >= 2:
-                    next_level = "medium"
-                    reason = "Пройдено, но с множественными ошибками. Закрепляем Medium."
-                else:
-                    next_level = "hard"
-                    reason = "Пройдено Medium успешно. Повышаем до Hard."
-            else:
-                next_level = "easy"
-                reason = "Провал Medium. Понижаем до Easy для практики."
-                
-        elif current == "easy":
-            if passed:
-                next_level = "medium"
-                reason = "Пройдено Easy. Повышаем до Medium."
-            else:
-                next_level = "easy"
-                reason = "Провал Easy. Повторяем Easy."
-                
-        elif current == "hard":
-            if passed:
-                next_level = "hard"
-                reason = "Пройдено Hard. Отлично! Сохраняем сложный уровень."
-            else:
-                next_level = "medium"
-                reason = "Провал Hard. Понижаем до Medium."
-                
+        key = (request.current_difficulty, request.is_passed, request.bad_attempts >= 2)
+        next_level, reason = self._TRANSITIONS.get(key, (request.current_difficulty, "Уровень сохранён."))
         return AdaptiveLevelResponse(next_level=next_level, reason=reason)
 
 adaptive_engine = AdaptiveDifficultyEngine()
@@ -1,85 +1,231 @@
-import sys
+import asyncio
 import io
 import contextlib
+import logging
+import multiprocessing
+import os
+import resource
+import math
+import signal
 import traceback
-from typing import List, Tuple, Any
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Предел времени на один тест: зависшее решение не должно держать генерацию задачи.
+# Внутри процесса тест прерывает таймер; внешний таймаут — страховка, если сигнал не сработал (зависание в C-коде)
+RUN_TIMEOUT_SECONDS = 2.0
+TEST_TIMEOUT_SECONDS = 5.0
+# Ограничение адресного пространства процесса пула
+MEMORY_LIMIT_BYTES = 256 * 1024 * 1024
+
+class _TimeLimitExceeded(BaseException):
+    """Срабатывание таймера теста; BaseException — чтобы `except Exception` в решении его не поглотил."""
+
+def _on_alarm(signum, frame):
+    raise _TimeLimitExceeded()
+
+def _arm_cpu_limit() -> None:
+    """Разрешает процессу ещё TEST_TIMEOUT_SECONDS процессорного времени сверх уже потраченного.
+
+    Процесс пула переиспользуется, а RLIMIT_CPU считает время за всю его жизнь, поэтому лимит
+    взводится заново перед каждым тестом. Превышение — SIGXCPU, который убивает процесс даже
+    при зависании в C-коде, где таймер SIGALRM не срабатывает.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = math.ceil(usage.ru_utime + usage.ru_stime + TEST_TIMEOUT_SECONDS)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def _init_worker() -> None:
+    """Настраивает процесс пула: лимиты памяти и процессорного времени, обработчик таймера теста."""
+    resource.setrlimit(resource.RLIMIT_AS, (MEMORY_LIMIT_BYTES, MEMORY_LIMIT_BYTES))
+    _arm_cpu_limit()
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+@lru_cache(maxsize=8)
+def _compile(code: str):
+    """Компилирует решение один раз на процесс пула (code object не передаётся через pickle)."""
+    return compile(code, "<canonical>", "exec")
+
+def _run_one(code: str, inp: str, index: int) -> dict:
+    """Выполняет код на одном входе; запускается в процессе пула.
+
+    Args:
+        code: Python код для выполнения
+        inp: Входные данные теста
+        index: Номер теста (для логов)
+
+    Returns:
+        dict: Результат выполнения теста
+    """
+    stdout_capture = io.StringIO()
+    stderr_capture = io.StringIO()
+
+    success = False
+    output = ""
+    error = ""
+
+    try:
+        # splitlines: \r\n от LLM не попадает в строку, а после последней строки input() вернёт ''
+        input_lines = iter(inp.splitlines())
+
+        def custom_input(prompt=''):
+            return next(input_lines, '')
+
+        with contextlib.redirect_stdout(stdout_capture), \
+             contextlib.redirect_stderr(stderr_capture):
+
+            exec_globals = {
+                '__builtins__': __builtins__,
+                'input': custom_input,
+            }
+            _arm_cpu_limit()
+            signal.setitimer(signal.ITIMER_REAL, RUN_TIMEOUT_SECONDS)
+            try:
+                exec(_compile(code), exec_globals)
+                success = True
+            except _TimeLimitExceeded:
+                error = f"TLE: превышено время выполнения ({RUN_TIMEOUT_SECONDS:g} с)"
+                success = False
+            except BaseException:
+                # В т.ч. SystemExit/KeyboardInterrupt из решения: они не должны уйти через future в event loop сервиса
+                error = traceback.format_exc()
+                success = False
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+
+        output = stdout_capture.getvalue().strip()
+        if not success:
+            logger.debug("Test %d failed input=%.50s error=%s", index + 1, inp, error)
+        else:
+            logger.debug("Test %d passed input=%.50s output=%.50s", index + 1, inp, output)
+
+        return {
+            "input": inp,
+            "output": output,
+            "error": error,
+            "success": success
+        }
+
+    except BaseException as e:
+        return {
+            "input": inp,
+            "output": "",
+            "error": str(e),
+            "success": False
+        }
 
 class CodeExecutor:
     """Исполнитель кода Python в песочнице."""
-    
-    def execute(self, code: str, inputs: List[str]) -> List[dict]:
-        """Выполняет код на списке входных данных.
-        
+
+    def __init__(self):
+        """Пул процессов создаётся при первом запуске."""
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers = os.cpu_count() or 1
+        # В пул отдаём не больше задач, чем в нём процессов: таймаут теста отсчитывается с момента,
+        # когда тест реально начал выполняться, а не пока он стоит в очереди пула
+        self._slots = asyncio.Semaphore(self._workers)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # forkserver: дочерние процессы не наследуют потоки и состояние event loop сервиса
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_init_worker,
+            )
+        return self._pool
+
+    def _reset_pool(self) -> None:
+        """Убивает процессы пула и останавливает его; следующий запуск создаст новый.
+
+        shutdown() не прерывает выполняющийся тест: зависший в C-коде процесс остался бы
+        занимать CPU, поэтому процессы завершаются SIGKILL до остановки пула.
+        """
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        # Публичного доступа к процессам у ProcessPoolExecutor нет
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, code: str, inp: str, index: int) -> dict:
+        """Запускает один тест в пуле, дождавшись свободного процесса."""
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            pool = self._get_pool()
+            try:
+                future = loop.run_in_executor(pool, _run_one, code, inp, index)
+            except BrokenProcessPool:
+                # Процесс пула упал в прошлом запуске (например, решение исчерпало память) — пул непригоден
+                if pool is self._pool:
+                    self._reset_pool()
+                pool = self._get_pool()
+                future = loop.run_in_executor(pool, _run_one, code, inp, index)
+            try:
+                return await asyncio.wait_for(future, timeout=TEST_TIMEOUT_SECONDS)
+            except BrokenProcessPool:
+                if pool is self._pool:
+                    raise
+                # Пул сбросил параллельный запуск (его тест завис) и убил в том числе этот процесс —
+                # тест не виноват, перезапускаем его один раз в новом пуле
+                future = loop.run_in_executor(self._get_pool(), _run_one, code, inp, index)
+                return await asyncio.wait_for(future, timeout=TEST_TIMEOUT_SECONDS)
+
+    async def execute(self, code: str, inputs: List[str]) -> List[dict]:
+        """Выполняет код на списке входных данных параллельно в пуле процессов.
+
         Args:
             code: Python код для выполнения
             inputs: Список входных данных (каждый - строка)
-            
+
         Returns:
             List[dict]: Результаты выполнения для каждого теста
         """
-        passed_count = 0
+        # Синтаксическую ошибку ловим до рассылки по процессам: она одинакова для всех тестов
+        try:
+            compile(code, "<canonical>", "exec")
+        except SyntaxError as e:
+            return [
+                {"input": inp, "output": "", "error": str(e), "success": False}
+                for inp in inputs
+            ]
+
+        outcomes = await asyncio.gather(
+            *(self._submit(code, inp, i) for i, inp in enumerate(inputs)),
+            return_exceptions=True,
+        )
+
         results = []
-        
-        for i, inp in enumerate(inputs):
-            stdout_capture = io.StringIO()
-            stderr_capture = io.StringIO()
-            
-            success = False
-            output = ""
-            error = ""
-            
-            try:
-                stdin_capture = io.StringIO(inp)
-                
-                input_lines = inp.split('\n') if inp else []
-                input_index = [0]
-                
-                def custom_input(prompt=''):
-                    if input_index[0] < len(input_lines):
-                        line = input_lines[input_index[0]]
-                        input_index[0] += 1
-                        return line
-                    return ''
-                
-                with contextlib.redirect_stdout(stdout_capture), \
-                     contextlib.redirect_stderr(stderr_capture):
-                    
-                    exec_globals = {
-                        '__builtins__': __builtins__,
-                        'input': custom_input,
-                    }
-                    try:
-                        exec(code, exec_globals)
-                        success = True
-                    except Exception:
-                        error = traceback.format_exc()
-                        success = False
-                
-                output = stdout_capture.getvalue().strip()
-                if not success:
-                    print(f"❌ CodeExecutor: Test {i+1} failed")
-                    print(f"   Input: {inp[:50]}...")
-                    print(f"   Error: {error}")
-                else:
-                    print(f"✅ CodeExecutor: Test {i+1} passed")
-                    print(f"   Input: {inp[:50]}...")
-                    print(f"   Output: {output[:50]}...")
-                
-                results.append({
-                    "input": inp,
-                    "output": output,
-                    "error": error,
-                    "success": success
-                })
-                
-            except Exception as e:
-                results.append({
-                    "input": inp,
-                    "output": "",
-                    "error": str(e),
-                    "success": False
-                })
-        
+        needs_reset = False
+        for inp, outcome in zip(inputs, outcomes):
+            if isinstance(outcome, dict):
+                results.append(outcome)
+                continue
+            if isinstance(outcome, asyncio.TimeoutError):
+                needs_reset = True
+                error = f"Превышено время выполнения ({TEST_TIMEOUT_SECONDS:g} с)"
+            else:
+                needs_reset = needs_reset or isinstance(outcome, BrokenProcessPool)
+                error = str(outcome)
+            results.append({
+                "input": inp,
+                "output": "",
+                "error": error,
+                "success": False
+            })
+
+        if needs_reset:
+            # Пул с зависшим процессом (или уже сломанный) больше не используем — следующий запуск создаст новый
+            self._reset_pool()
+
         return results
 
 code_executor = CodeExecutor()
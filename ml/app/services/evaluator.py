@@ -15,7 +15,7 @@ class Evaluator:
         Returns:
             EvaluationResult: Результат оценки с метриками и обратной связью
         """
-        execution_results = code_executor.execute(request.code, request.hidden_tests)
+        execution_results = await code_executor.execute(request.code, request.hidden_tests)
         
         prompt = self._build_evaluation_prompt(request, execution_results)
         
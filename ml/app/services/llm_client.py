@@ -1,7 +1,28 @@
+import asyncio
+import logging
 import httpx
-import json
+import orjson
+import re
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from app.core.config import settings
+from app.services.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+# Первый блок ```...```; короткое указание языка в первой строке (json, python, ...) отбрасывается.
+# После json перевод строки необязателен (```json{...}```); у остальных тегов он нужен, чтобы не
+# принять за тег начало кода в однострочном блоке вроде ```print(1)```.
+# Закрывающая ``` необязательна — ответ модели мог обрезаться по max_tokens
+FENCE_RE = re.compile(r"```(?:json(?![A-Za-z])\s*|[A-Za-z]{1,14}[ \t]*\n)?(.*?)(?:```|$)", re.DOTALL)
+
+@dataclass(slots=True)
+class _Inflight:
+    """Запрос к API, разделяемый одинаковыми вызовами generate, и число его ожидающих."""
+
+    task: asyncio.Task
+    waiters: int = 0
 
 class LLMClient:
     """Клиент для работы с LLM моделями."""
@@ -16,6 +37,35 @@ class LLMClient:
         }
         self.timeout = httpx.Timeout(60.0, connect=10.0)
         self.verify_ssl = True
+        self.limits = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_lock = asyncio.Lock()
+        # Одинаковые запросы, уже отправленные в API: повторный вызов ждёт тот же ответ
+        self._inflight: Dict[str, _Inflight] = {}
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Возвращает общий HTTP-клиент, создавая его при первом обращении.
+
+        Один клиент на процесс держит keep-alive соединения с API, а HTTP/2
+        мультиплексирует параллельные запросы генерации в одном TCP-соединении.
+        """
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.AsyncClient(
+                        headers=self.headers,
+                        timeout=self.timeout,
+                        verify=self.verify_ssl,
+                        limits=self.limits,
+                        http2=True,
+                    )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Закрывает общий HTTP-клиент (вызывается при остановке сервиса)."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
 
     async def generate(
         self, 
@@ -47,42 +97,112 @@ class LLMClient:
         if json_mode:
             payload["response_format"] = {"type": "json_object"}
 
-        async with httpx.AsyncClient(timeout=self.timeout, verify=self.verify_ssl) as client:
-            try:
-                print(f"🔗 Отправляем запрос к: {self.base_url}/chat/completions")
-                print(f"🔑 API ключ: {self.api_key[:20]}...")
-                print(f"🔒 SSL проверка: {self.verify_ssl}")
-                
-                response = await client.post(
-                    f"{self.base_url}/chat/completions", 
-                    headers=self.headers, 
-                    json=payload
-                )
+        key = response_cache.make_key(model, messages, temperature, max_tokens, json_mode)
+        # Высокая температура — ответы должны различаться, такие запросы не кэшируем
+        cacheable = temperature <= settings.LLM_CACHE_MAX_TEMPERATURE
+        if cacheable:
+            cached = await response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        if not cacheable:
+            # Такие ответы должны различаться (генерация задач) — одинаковые запросы не склеиваем
+            return await self._fetch(payload, json_mode, None)
+
+        # Между проверкой и записью в _inflight нет await — отдельная блокировка не нужна
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = _Inflight(asyncio.create_task(self._fetch(payload, json_mode, key)))
+            self._inflight[key] = inflight
+            inflight.task.add_done_callback(lambda _: self._forget(key, inflight))
+        inflight.waiters += 1
+        try:
+            # shield: отмена одного из ожидающих не обрывает запрос для остальных
+            return await asyncio.shield(inflight.task)
+        finally:
+            inflight.waiters -= 1
+            if inflight.waiters == 0 and not inflight.task.done():
+                # Ушёл последний ожидающий (например, отменён спекулятивный запрос) — обрываем и сам запрос
+                inflight.task.cancel()
+                self._forget(key, inflight)
+
+    def _forget(self, key: str, inflight: "_Inflight") -> None:
+        """Убирает запрос из _inflight, если под ключом всё ещё он, а не более новый."""
+        if self._inflight.get(key) is inflight:
+            del self._inflight[key]
+
+    async def _fetch(self, payload: Dict[str, Any], json_mode: bool, cache_key: Optional[str]) -> str:
+        """Выполняет запрос к API и сохраняет ответ в кэш (если cache_key задан)."""
+        # JSON-ответ по частям не разобрать — его читаем целиком, текст (код решений) — потоком
+        content = await self._request(payload, stream=not json_mode)
+        if cache_key is not None:
+            await response_cache.set(cache_key, content)
+        return content
+
+    async def _request(self, payload: Dict[str, Any], stream: bool = False) -> str:
+        """Отправляет запрос chat/completions и возвращает текст ответа.
+
+        Args:
+            payload: Тело запроса
+            stream: Получать ответ потоком SSE и собирать текст из delta-фрагментов
+        """
+        client = await self._get_client()
+        url = f"{self.base_url}/chat/completions"
+        try:
+            logger.debug("Запрос к %s (model=%s, stream=%s)", url, payload["model"], stream)
+
+            if stream:
+                return await self._request_stream(client, url, payload)
+
+            # Content-Type: application/json уже в заголовках клиента
+            response = await client.post(url, content=orjson.dumps(payload))
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            return data["choices"][0]["message"]["content"]
+        except httpx.ConnectError as e:
+            error_msg = f"Не удается подключиться к Groq API. Проверьте интернет соединение. URL: {self.base_url}. Ошибка: {e}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+        except httpx.HTTPStatusError as e:
+            error_msg = f"API вернул HTTP ошибку {e.response.status_code}: {e.response.text}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+        except httpx.TimeoutException as e:
+            error_msg = f"Таймаут при обращении к LLM API: {e}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+        except Exception as e:
+            error_msg = f"Неожиданная ошибка LLM клиента ({type(e).__name__}): {e}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+    async def _request_stream(self, client: httpx.AsyncClient, url: str, payload: Dict[str, Any]) -> str:
+        """Читает ответ в режиме stream и склеивает choices[0].delta.content."""
+        parts: List[str] = []
+        async with client.stream("POST", url, content=orjson.dumps({**payload, "stream": True})) as response:
+            if response.is_error:
+                # Тело ошибки нужно прочитать до raise_for_status, иначе e.response.text недоступен
+                await response.aread()
                 response.raise_for_status()
-                data = response.json()
-                return data["choices"][0]["message"]["content"]
-            except httpx.ConnectError as e:
-                error_msg = f"Не удается подключиться к Groq API. Проверьте интернет соединение. URL: {self.base_url}. Ошибка: {e}"
-                print(f"❌ {error_msg}")
-                raise Exception(error_msg)
-            except httpx.HTTPStatusError as e:
-                error_msg = f"API вернул HTTP ошибку {e.response.status_code}: {e.response.text}"
-                print(f"❌ {error_msg}")
-                raise Exception(error_msg)
-            except httpx.TimeoutException as e:
-                error_msg = f"Таймаут при обращении к LLM API: {e}"
-                print(f"❌ {error_msg}")
-                raise Exception(error_msg)
-            except Exception as e:
-                error_msg = f"Неожиданная ошибка LLM клиента ({type(e).__name__}): {e}"
-                print(f"❌ {error_msg}")
-                raise Exception(error_msg)
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = orjson.loads(data).get("choices") or []
+                if choices:
+                    delta = choices[0].get("delta") or {}
+                    if delta.get("content"):
+                        parts.append(delta["content"])
+        return "".join(parts)
 
     async def generate_json(
         self, 
         model: str, 
         messages: List[Dict[str, str]], 
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        max_tokens: int = 2048
     ) -> Dict[str, Any]:
         """Генерирует JSON ответ от LLM.
         
@@ -90,6 +210,7 @@ class LLMClient:
             model: Название модели
             messages: Список сообщений
             temperature: Температура генерации
+            max_tokens: Максимальное количество токенов
             
         Returns:
             Dict[str, Any]: Спарсенный JSON ответ
@@ -97,36 +218,42 @@ class LLMClient:
         if messages and "json" not in messages[-1].get("content", "").lower():
              messages[-1]["content"] += "\n\nPlease respond with valid JSON."
 
-        content = await self.generate(model, messages, temperature, json_mode=True)
-        
-        print(f"📝 Получен ответ от LLM (первые 500 символов): {content[:500]}")
+        content = await self.generate(model, messages, temperature, max_tokens=max_tokens, json_mode=True)
         
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Получен ответ от LLM (первые 500 символов): %.500s", content)
+
         if "<think>" in content:
-            import re
-            content = re.sub(r'<think>.*?</think>', '', content, flags=re.DOTALL)
-            print(f"🧹 Удалены теги <think>, новая длина: {len(content)}")
-        
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-            
+            content = _THINK_RE.sub("", content)
+            logger.debug("Удалены теги <think>, новая длина: %d", len(content))
+
         try:
-            parsed = json.loads(content)
-            print(f"✅ JSON успешно распарсен, ключи: {list(parsed.keys()) if isinstance(parsed, dict) else 'not a dict'}")
-            
-            if isinstance(parsed, dict) and 'content' in parsed and isinstance(parsed['content'], str):
-                print(f"🔄 Обнаружен вложенный JSON в поле 'content', извлекаем...")
-                try:
-                    parsed = json.loads(parsed['content'])
-                    print(f"✅ Вложенный JSON распарсен, ключи: {list(parsed.keys()) if isinstance(parsed, dict) else 'not a dict'}")
-                except json.JSONDecodeError:
-                    print(f"⚠️ Не удалось распарсить вложенный JSON, используем исходный")
-            
-            return parsed
-        except json.JSONDecodeError as e:
-            print(f"❌ Не удалось распарсить JSON: {e}")
-            print(f"📄 Полный контент: {content}")
-            raise ValueError("Модель не вернула корректный JSON")
+            # Сначала разбираем ответ как есть: ``` внутри строк JSON (код решения в fused-ответе)
+            # не должен резать корректный документ. Ограждение снимаем, только если разбор не удался
+            parsed = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            match = FENCE_RE.search(content)
+            content = match.group(1).strip() if match else content.strip()
+            try:
+                parsed = orjson.loads(content)
+            except orjson.JSONDecodeError as e:
+                logger.error("Не удалось распарсить JSON: %s", e)
+                logger.debug("Полный контент: %s", content)
+                raise ValueError("Модель не вернула корректный JSON")
+
+        if debug:
+            logger.debug("JSON распарсен, ключи: %s", list(parsed) if isinstance(parsed, dict) else "not a dict")
+
+        if isinstance(parsed, dict) and 'content' in parsed and isinstance(parsed['content'], str):
+            logger.debug("Обнаружен вложенный JSON в поле 'content', извлекаем")
+            try:
+                parsed = orjson.loads(parsed['content'])
+                if debug:
+                    logger.debug("Вложенный JSON распарсен, ключи: %s", list(parsed) if isinstance(parsed, dict) else "not a dict")
+            except orjson.JSONDecodeError:
+                logger.warning("Не удалось распарсить вложенный JSON, используем исходный")
+
+        return parsed
 
 llm_client = LLMClient()
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """Персистентный кэш ответов LLM с точным совпадением запроса (SQLite)."""
+
+    def __init__(self, path: str, ttl_seconds: int, max_rows: int):
+        """Инициализирует кэш; соединение с базой открывается при первом обращении.
+
+        Args:
+            path: Путь к файлу SQLite
+            ttl_seconds: Время жизни записи в секундах
+            max_rows: Предел числа записей; при превышении удаляются самые старые
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool
+    ) -> str:
+        """Строит ключ кэша по канонизированному запросу.
+
+        Returns:
+            str: SHA256 от запроса в JSON с отсортированными ключами
+        """
+        request = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "json_mode": json_mode,
+        }
+        canonical = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response_text TEXT NOT NULL, "
+                "created_at REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at)")
+            self._purge(self._conn)
+        return self._conn
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        """Удаляет просроченные записи и самые старые сверх max_rows: get их не вернёт, а файл растёт."""
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        conn.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+        conn.commit()
+
+    def _get_sync(self, key: str) -> Optional[str]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT response_text, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response_text, created_at = row
+            if time.time() - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE responses SET hits = hits + 1 WHERE key = ?", (key,))
+            conn.commit()
+            return response_text
+
+    def _set_sync(self, key: str, response_text: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response_text, created_at, hits) VALUES (?, ?, ?, 0)",
+                (key, response_text, time.time()),
+            )
+            self._purge(conn)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Возвращает закэшированный ответ или None (ошибки базы считаются промахом)."""
+        try:
+            response_text = await asyncio.to_thread(self._get_sync, key)
+        except sqlite3.Error as e:
+            logger.warning("Ошибка чтения кэша LLM: %s", e)
+            response_text = None
+        if response_text is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response_text
+
+    async def set(self, key: str, response_text: str) -> None:
+        """Сохраняет ответ в кэш; ошибка записи не прерывает генерацию."""
+        try:
+            await asyncio.to_thread(self._set_sync, key, response_text)
+        except sqlite3.Error as e:
+            logger.warning("Ошибка записи кэша LLM: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Счётчики попаданий и промахов с момента старта процесса."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+response_cache = ResponseCache(
+    settings.LLM_CACHE_PATH, settings.LLM_CACHE_TTL_SECONDS, settings.LLM_CACHE_MAX_ROWS
+)
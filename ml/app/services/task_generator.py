@@ -1,10 +1,112 @@
 from app.core.config import settings
-from app.services.llm_client import llm_client
+from app.services.llm_client import llm_client, FENCE_RE
 from app.models.schemas import Task
 from app.services.hint_service import hint_service
 from app.services.code_executor import code_executor
-import json
+import asyncio
+import orjson
 import re
+from dataclasses import dataclass, field
+from typing import Any
+
+LANGUAGE_NAMES = {
+    'python': 'Python',
+    'go': 'Go',
+    'java': 'Java',
+    'typescript': 'TypeScript',
+}
+IO_GUIDANCE = {
+    'python': "- Код должен читать вход через input()/sys.stdin и печатать через print().",
+    'go': "- Используй пакет bufio и os.Stdin для чтения. Функция main в пакете main, вывод через fmt.Println.",
+    'java': "- Используй класс Main с методом public static void main. Читай через BufferedReader/Scanner, вывод через System.out.",
+    'typescript': "- Запускается в Node.js. Читай ввод через require('fs').readFileSync(0, 'utf8').",
+}
+
+_SOLUTION_REQUIREMENTS = """Требования:
+- Решение должно читать данные ТОЧНО в том формате, который указан в "Формат входных данных" и примерах
+- Решение должно выводить результат ТОЧНО в том формате, который указан в "Формат выходных данных" и примерах
+- Используй только стандартную библиотеку языка
+- Не добавляй комментарии, объяснения и Markdown. Верни ТОЛЬКО чистый код"""
+
+_BASE_PROMPT = """
+        Сгенерируй алгоритмическую задачу для собеседования НА РУССКОМ ЯЗЫКЕ.
+        
+        ВАЖНО: 
+        - Верни ТОЛЬКО валидный JSON, без дополнительного текста
+        - НЕ используй теги <think> или другие обертки
+        - Весь текст должен быть на русском языке
+        - В массиве examples должно быть ровно 3 объекта с корректными парами {"input": "...", "output": "..."}
+        
+        Формат JSON:
+        {
+          "title": "string (название задачи на русском)",
+          "description": "string (подробное описание задачи на русском)",
+          "input_format": "string (формат входных данных на русском)",
+          "output_format": "string (формат выходных данных на русском)",
+          "examples": [{"input": "string", "output": "string"}],
+          "constraints": ["string"]
+        }
+        """
+
+# Промпты генерации собираются один раз при импорте: уровней сложности всего три
+_PROMPTS = {
+    "easy": _BASE_PROMPT + """
+            Сложность: ЛЕГКАЯ.
+            Темы: Базовые массивы, строки, простая математика, циклы.
+            Сложность алгоритма: O(n) или O(1).
+            Примеры задач: Найти максимальный элемент, подсчитать четные числа, перевернуть строку.
+            """,
+    "medium": _BASE_PROMPT + """
+            Сложность: СРЕДНЯЯ.
+            Темы: Хеш-таблицы, Два указателя, Скользящее окно, Логика сортировки (без встроенных функций), Вложенные циклы.
+            Сложность алгоритма: O(n^2) или O(n log n).
+            Примеры задач: Первый уникальный символ, Переместить нули, Наибольший общий префикс.
+            """,
+    "hard": _BASE_PROMPT + """
+            Сложность: ВЫСОКАЯ.
+            Темы: Сложные реализации сортировок (QuickSort, MergeSort), Рекурсия, Деревья, Основы динамического программирования.
+            Ограничение: Явно попроси реализовать конкретный алгоритм (например, QuickSort) вручную.
+            """,
+}
+
+@dataclass(slots=True, frozen=True)
+class _TaskMeta:
+    """Условие задачи, разобранное один раз, с общим для всех промптов блоком контекста."""
+
+    title: str = ""
+    description: str = ""
+    input_format: str = ""
+    output_format: str = ""
+    constraints: Any = None
+    examples: list = field(default_factory=list)
+    # Вычисляется в __post_init__: cached_property несовместим со slots
+    prompt_prefix: str = field(init=False, repr=False, default="")
+
+    @classmethod
+    def from_task_data(cls, task_data: dict) -> "_TaskMeta":
+        """Берёт из ответа LLM только поля условия (лишние ключи игнорируются)."""
+        return cls(
+            title=task_data.get("title") or "",
+            description=task_data.get("description") or "",
+            input_format=task_data.get("input_format") or "",
+            output_format=task_data.get("output_format") or "",
+            constraints=task_data.get("constraints"),
+            examples=list(task_data.get("examples") or []),
+        )
+
+    def __post_init__(self):
+        parts = [
+            f"Название задачи: {self.title}",
+            f"Описание: {self.description}",
+            f"Формат входных данных: {self.input_format}",
+            f"Формат выходных данных: {self.output_format}",
+            f"Ограничения: {self.constraints}",
+        ]
+        if self.examples:
+            parts.append("Примеры:\n" + "\n\n".join(
+                f"Вход:\n{ex.get('input', '')}\nВыход:\n{ex.get('output', '')}" for ex in self.examples
+            ))
+        object.__setattr__(self, "prompt_prefix", "\n".join(parts))
 
 class TaskGenerator:
     """Генератор алгоритмических задач с использованием LLM."""
@@ -35,7 +137,21 @@ class TaskGenerator:
             temperature=0.8
         )
         
-        hidden_test_inputs = await self._generate_hidden_tests(task_data) or []
+        meta = _TaskMeta.from_task_data(task_data)
+        
+        # Скрытые тесты, эталон на Python и подсказки зависят только от условия — запрашиваем параллельно.
+        # Подсказки строятся по примерам из условия, сгенерированным вместе с задачей.
+        (hidden_test_inputs, python_solution), hints = await asyncio.gather(
+            self._generate_tests_and_solution(meta, difficulty),
+            hint_service.generate_hints(
+                task_description=meta.description,
+                task_difficulty=difficulty,
+                input_format=meta.input_format,
+                output_format=meta.output_format,
+                examples=meta.examples
+            ),
+        )
+        hidden_test_inputs = hidden_test_inputs or []
         
         # Гарантируем, что тестов не менее 18 штук (3 открытых + 15 закрытых)
         while len(hidden_test_inputs) < 18:
@@ -43,13 +159,12 @@ class TaskGenerator:
         hidden_test_inputs = hidden_test_inputs[:18]
         
         canonical_solutions: dict[str, str] = {}
-        python_solution = await self._generate_canonical_solution(task_data, difficulty, language='python')
         if python_solution:
             canonical_solutions['python'] = python_solution
         
         if preferred_language != 'python':
             lang_solution = await self._generate_canonical_solution(
-                task_data,
+                meta,
                 difficulty,
                 language=preferred_language,
                 reference_solution=python_solution,
@@ -62,26 +177,25 @@ class TaskGenerator:
         task_data["canonical_solutions"] = canonical_solutions or None
         
         test_cases: list[dict[str, str]] = []
-        if python_solution:
-            print(f"🔧 Executing canonical solution to generate test outputs...")
-            executor_results = code_executor.execute(python_solution, hidden_test_inputs)
-            if executor_results and len(executor_results) == len(hidden_test_inputs):
-                all_success = all(res.get("success") for res in executor_results)
-                if all_success:
-                    test_cases = [
-                        {"input": res["input"], "output": res.get("output", "")}
-                        for res in executor_results
-                    ]
-                    print(f"✅ Generated {len(test_cases)} test outputs from canonical solution")
-                else:
-                    print(f"❌ Canonical solution failed on some tests")
-                    for idx, res in enumerate(executor_results):
-                        if not res.get("success"):
-                            print(f"   Test {idx+1} failed: {res.get('error', 'Unknown error')[:100]}")
-        
-        if not test_cases or len(test_cases) < len(hidden_test_inputs):
-            print(f"⚠️  Canonical solution didn't generate all outputs, using LLM fallback...")
-            hidden_tests_with_outputs = await self._generate_hidden_test_outputs(task_data, hidden_test_inputs)
+        llm_outputs_task: asyncio.Task | None = None
+        if python_solution and settings.SPECULATIVE_TEST_OUTPUTS and difficulty == "hard":
+            # На hard эталон от LLM часто падает: выходы от LLM запрашиваем сразу, не дожидаясь запуска эталона,
+            # и отменяем запрос, если эталон прошёл все тесты
+            async with asyncio.TaskGroup() as tg:
+                llm_outputs_task = tg.create_task(self._generate_hidden_test_outputs(meta, hidden_test_inputs))
+                test_cases = await self._run_canonical_solution(python_solution, hidden_test_inputs)
+                if test_cases:
+                    llm_outputs_task.cancel()
+        elif python_solution:
+            test_cases = await self._run_canonical_solution(python_solution, hidden_test_inputs)
+        
+        if not test_cases:
+            if llm_outputs_task is not None:
+                print(f"⚠️  Canonical solution didn't generate all outputs, using speculative LLM outputs...")
+                hidden_tests_with_outputs = llm_outputs_task.result()
+            else:
+                print(f"⚠️  Canonical solution didn't generate all outputs, using LLM fallback...")
+                hidden_tests_with_outputs = await self._generate_hidden_test_outputs(meta, hidden_test_inputs)
             test_cases = hidden_tests_with_outputs or []
             
             valid_test_cases = [tc for tc in test_cases if tc.get("output", "").strip()]
@@ -105,22 +219,46 @@ class TaskGenerator:
         task_data["hidden_tests"] = [case["input"] for case in hidden_test_cases]
         task_data["difficulty"] = difficulty
         
-        hints = await hint_service.generate_hints(
-            task_description=task_data.get("description", ""),
-            task_difficulty=difficulty,
-            input_format=task_data.get("input_format", ""),
-            output_format=task_data.get("output_format", ""),
-            examples=task_data.get("examples", [])
-        )
         task_data["hints"] = [hint.dict() for hint in hints]
         
         return Task(**task_data)
 
-    async def _generate_hidden_tests(self, task_data: dict) -> list[str]:
+    async def _run_canonical_solution(self, python_solution: str, hidden_test_inputs: list[str]) -> list[dict]:
+        """Получает выходы тестов запуском эталонного решения на Python.
+        
+        Args:
+            python_solution: Эталонное решение
+            hidden_test_inputs: Входные данные тестов
+            
+        Returns:
+            list[dict]: Тесты с input и output или пустой список, если эталон упал хотя бы на одном тесте
+        """
+        print(f"🔧 Executing canonical solution to generate test outputs...")
+        # Добивка до 18 тестов дублирует входы — детерминированное решение на каждом уникальном входе запускаем один раз
+        unique_inputs = list(dict.fromkeys(hidden_test_inputs))
+        unique_results = await code_executor.execute(python_solution, unique_inputs)
+        if len(unique_results) != len(unique_inputs):
+            return []
+        result_by_input = dict(zip(unique_inputs, unique_results))
+        executor_results = [result_by_input[inp] for inp in hidden_test_inputs]
+        if not all(res.get("success") for res in executor_results):
+            print(f"❌ Canonical solution failed on some tests")
+            for idx, res in enumerate(executor_results):
+                if not res.get("success"):
+                    print(f"   Test {idx+1} failed: {res.get('error', 'Unknown error')[:100]}")
+            return []
+        test_cases = [
+            {"input": res["input"], "output": res.get("output", "")}
+            for res in executor_results
+        ]
+        print(f"✅ Generated {len(test_cases)} test outputs from canonical solution")
+        return test_cases
+
+    async def _generate_hidden_tests(self, meta: _TaskMeta) -> list[str]:
         """Генерирует скрытые тесты для задачи.
         
         Args:
-            task_data: Данные задачи
+            meta: Условие задачи
             
         Returns:
             list[str]: Список входных данных для тестов
@@ -137,9 +275,7 @@ class TaskGenerator:
         Первые 3 теста должны быть простыми и понятными (для примеров).
         Остальные 15 тестов должны быть сложнее и проверять устойчивость алгоритма.
         
-        Название задачи: {task_data.get('title')}
-        Описание: {task_data.get('description')}
-        Формат входных данных: {task_data.get('input_format')}
+{meta.prompt_prefix}
         
         Верни ТОЛЬКО JSON массив строк. Каждая строка - это сырые входные данные, готовые к подаче в stdin.
         Пример формата: ["1 2 3", "100", "-5 0 5"]
@@ -159,52 +295,112 @@ class TaskGenerator:
                 ],
                 temperature=0.5
             )
-            sanitized: list[str] = []
-            if isinstance(tests, list):
-                for item in tests:
-                    if isinstance(item, str):
-                        sanitized.append(item.strip())
-                    elif isinstance(item, dict) and "input" in item:
-                        sanitized.append(str(item["input"]))
-            elif isinstance(tests, dict) and "tests" in tests:
-                for item in tests["tests"]:
-                    if isinstance(item, str):
-                        sanitized.append(item.strip())
-                    elif isinstance(item, dict) and "input" in item:
-                        sanitized.append(str(item["input"]))
-            return sanitized
+            if isinstance(tests, dict):
+                tests = tests.get("tests", [])
+            return self._sanitize_test_inputs(tests)
         except Exception as e:
             print(f"Ошибка при генерации скрытых тестов: {e}")
             return []
+
+    def _sanitize_test_inputs(self, tests) -> list[str]:
+        """Приводит ответ модели со входами тестов к списку строк.
+
+        Args:
+            tests: Список строк или объектов {"input": ...}
+
+        Returns:
+            list[str]: Входные данные тестов
+        """
+        sanitized: list[str] = []
+        if isinstance(tests, list):
+            for item in tests:
+                if isinstance(item, str):
+                    sanitized.append(item.strip())
+                elif isinstance(item, dict) and "input" in item:
+                    sanitized.append(str(item["input"]))
+        return sanitized
+
+    async def _generate_tests_and_solution(self, meta: _TaskMeta, difficulty: str) -> tuple[list[str], str]:
+        """Генерирует скрытые тесты и эталонное решение на Python одним запросом к LLM.
+
+        Оба ответа строятся по одному и тому же условию задачи, поэтому общий контекст
+        отправляется один раз. Если модель не вернула одну из частей, она догенерируется
+        отдельным запросом.
+
+        Args:
+            meta: Условие задачи
+            difficulty: Уровень сложности
+
+        Returns:
+            tuple[list[str], str]: Входные данные тестов и эталонное решение
+        """
+        prompt = f"""
+        Для следующей алгоритмической задачи подготовь скрытые тесты и эталонное решение на Python.
+        
+{meta.prompt_prefix}
+        
+        1. Поле "tests": 18 УНИКАЛЬНЫХ тестовых входных данных. Каждая строка - это сырые входные данные, готовые к подаче в stdin.
+        Тесты должны покрывать базовые случаи, граничные случаи (минимальные/максимальные значения, пустые структуры,
+        одиночные элементы), отрицательные числа и нули (если применимо), повторяющиеся элементы и большие значения.
+        Первые 3 теста должны быть простыми и понятными, остальные 15 - сложнее.
+        
+        2. Поле "solution": оптимальное решение на Python для уровня сложности {difficulty}.
+        - Решение должно читать данные ТОЧНО в том формате, который указан в "Формат входных данных" и примерах
+        - Решение должно выводить результат ТОЧНО в том формате, который указан в "Формат выходных данных" и примерах
+        - Используй только стандартную библиотеку
+        - Без комментариев, объяснений и Markdown
+        {IO_GUIDANCE['python']}
+        
+        Верни ТОЛЬКО JSON объект: {{"tests": ["1 2 3", "100", ...], "solution": "код решения"}}
+        """
+        tests: list[str] = []
+        solution = ""
+        try:
+            result = await llm_client.generate_json(
+                model=settings.MODEL_CODER,
+                messages=[
+                    {"role": "system", "content": "Ты опытный инженер по алгоритмам: генерируешь тестовые случаи и рабочие решения на Python."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=4096
+            )
+            if isinstance(result, dict):
+                tests = self._sanitize_test_inputs(result.get("tests"))
+                if isinstance(result.get("solution"), str):
+                    solution = self._extract_code_block(result["solution"])
+        except Exception as e:
+            print(f"Ошибка при совместной генерации тестов и решения: {e}")
+
+        if not tests and not solution:
+            tests, solution = await asyncio.gather(
+                self._generate_hidden_tests(meta),
+                self._generate_canonical_solution(meta, difficulty, language='python'),
+            )
+            return tests, solution
+        if not tests:
+            tests = await self._generate_hidden_tests(meta)
+        if not solution:
+            solution = await self._generate_canonical_solution(meta, difficulty, language='python')
+        return tests, solution
     
-    async def _generate_hidden_test_outputs(self, task_data: dict, hidden_test_inputs: list[str]) -> list[dict]:
+    async def _generate_hidden_test_outputs(self, meta: _TaskMeta, hidden_test_inputs: list[str]) -> list[dict]:
         """Генерирует outputs для скрытых тестов.
         
         Args:
-            task_data: Данные задачи
+            meta: Условие задачи
             hidden_test_inputs: Список входных данных для скрытых тестов
             
         Returns:
             list[dict]: Список тестов с input и output
         """
-        examples_text = "\n".join([
-            f"Вход: {ex.get('input', '')}\nВыход: {ex.get('output', '')}"
-            for ex in task_data.get('examples', [])
-        ])
-        
         prompt = f"""
         Для следующей алгоритмической задачи сгенерируй правильные выходные данные для каждого входного теста.
         
-        Название задачи: {task_data.get('title')}
-        Описание: {task_data.get('description')}
-        Формат входных данных: {task_data.get('input_format')}
-        Формат выходных данных: {task_data.get('output_format')}
-        
-        Примеры:
-        {examples_text}
+{meta.prompt_prefix}
         
         Входные тесты (сгенерируй для каждого правильный выход):
-        {json.dumps(hidden_test_inputs, ensure_ascii=False, indent=2)}
+        {orjson.dumps(hidden_test_inputs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()}
         
         Верни ТОЛЬКО JSON массив объектов в формате:
         [{{"input": "входные данные", "output": "выходные данные"}}, ...]
@@ -262,7 +458,7 @@ class TaskGenerator:
     
     async def _generate_canonical_solution(
         self,
-        task_data: dict,
+        meta: _TaskMeta,
         difficulty: str,
         language: str = 'python',
         reference_solution: str | None = None,
@@ -270,7 +466,7 @@ class TaskGenerator:
         """Генерирует эталонное решение.
         
         Args:
-            task_data: Данные задачи
+            meta: Условие задачи
             difficulty: Уровень сложности
             language: Язык программирования
             reference_solution: Референсное решение
@@ -278,58 +474,25 @@ class TaskGenerator:
         Returns:
             str: Эталонное решение
         """
-        language_names = {
-            'python': 'Python',
-            'go': 'Go',
-            'java': 'Java',
-            'typescript': 'TypeScript',
-        }
-        io_guidance = {
-            'python': "- Код должен читать вход через input()/sys.stdin и печатать через print().",
-            'go': "- Используй пакет bufio и os.Stdin для чтения. Функция main в пакете main, вывод через fmt.Println.",
-            'java': "- Используй класс Main с методом public static void main. Читай через BufferedReader/Scanner, вывод через System.out.",
-            'typescript': "- Запускается в Node.js. Читай ввод через require('fs').readFileSync(0, 'utf8').",
-        }
-        reference_block = ''
+        language_name = LANGUAGE_NAMES.get(language, language.title())
+        parts = [
+            f"Ты опытный инженер по алгоритмам. Напиши оптимальное решение задачи НА {language_name.upper()}.",
+            meta.prompt_prefix,
+        ]
+        parts.append(_SOLUTION_REQUIREMENTS + f"\n- Решение должно быть оптимальным по времени и памяти для уровня сложности {difficulty}")
+        if language in IO_GUIDANCE:
+            parts.append(IO_GUIDANCE[language])
         if reference_solution and language != 'python':
-            reference_block = f"""
-Вот корректное решение на Python, на которое можно опираться:
-```
-{reference_solution}
-```
-Напиши эквивалент на {language_names.get(language, language.title())}, соблюдая стиль и требования языка.
-"""
-        examples_formatted = []
-        for ex in task_data.get('examples', []):
-            examples_formatted.append(f"Вход:\n{ex.get('input', '')}\nВыход:\n{ex.get('output', '')}")
-        examples_text = "\n\n".join(examples_formatted)
-        
-        prompt = f"""
-Ты опытный инженер по алгоритмам. Напиши оптимальное решение задачи НА {language_names.get(language, language.title()).upper()}.
-        
-        Название задачи: {task_data.get('title')}
-        Описание: {task_data.get('description')}
-        Формат входных данных: {task_data.get('input_format')}
-        Формат выходных данных: {task_data.get('output_format')}
-        Ограничения: {task_data.get('constraints')}
-        
-        Примеры:
-        {examples_text}
-        
-        Требования:
-- Решение должно читать данные ТОЧНО в том формате, который указан в "Формат входных данных" и примерах
-- Решение должно выводить результат ТОЧНО в том формате, который указан в "Формат выходных данных" и примерах
-- Используй только стандартную библиотеку языка
-- Решение должно быть оптимальным по времени и памяти для уровня сложности {difficulty}
-- Не добавляй комментарии, объяснения и Markdown. Верни ТОЛЬКО чистый код
-{io_guidance.get(language, '')}
-{reference_block}
-        """
+            parts.append(
+                f"Вот корректное решение на Python, на которое можно опираться:\n```\n{reference_solution}\n```\n"
+                f"Напиши эквивалент на {language_name}, соблюдая стиль и требования языка."
+            )
+        prompt = "\n".join(parts)
         try:
             content = await llm_client.generate(
                 model=settings.MODEL_CODER,
                 messages=[
-                    {"role": "system", "content": f"Ты пишешь рабочие решения алгоритмических задач на {language_names.get(language, language.title())}."},
+                    {"role": "system", "content": f"Ты пишешь рабочие решения алгоритмических задач на {language_name}."},
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0.15,
@@ -349,21 +512,14 @@ class TaskGenerator:
         Returns:
             str: Извлеченный код
         """
-        if "```" in content:
-            parts = content.split("```")
-            if len(parts) >= 2:
-                candidate = parts[1]
-                # Удаляем возможное указание языка в первой строке
-                candidate_lines = candidate.split('\n')
-                if candidate_lines:
-                    first_line = candidate_lines[0].strip()
-                    if len(candidate_lines) > 1 and len(first_line) < 15 and first_line.isalpha():
-                        candidate_lines = candidate_lines[1:]
-                content = '\n'.join(candidate_lines)
+        # Указание языка в первой строке блока отбрасывает сам шаблон
+        match = FENCE_RE.search(content)
+        if match:
+            content = match.group(1)
         return content.strip()
 
     def _get_generation_prompt(self, difficulty: str) -> str:
-        """Формирует промпт для генерации задачи в зависимости от уровня сложности.
+        """Возвращает промпт для генерации задачи в зависимости от уровня сложности.
         
         Args:
             difficulty: Уровень сложности ('easy', 'medium', 'hard')
@@ -371,45 +527,6 @@ class TaskGenerator:
         Returns:
             str: Промпт для LLM
         """
-        base_prompt = """
-        Сгенерируй алгоритмическую задачу для собеседования НА РУССКОМ ЯЗЫКЕ.
-        
-        ВАЖНО: 
-        - Верни ТОЛЬКО валидный JSON, без дополнительного текста
-        - НЕ используй теги <think> или другие обертки
-        - Весь текст должен быть на русском языке
-        - В массиве examples должно быть ровно 3 объекта с корректными парами {"input": "...", "output": "..."}
-        
-        Формат JSON:
-        {
-          "title": "string (название задачи на русском)",
-          "description": "string (подробное описание задачи на русском)",
-          "input_format": "string (формат входных данных на русском)",
-          "output_format": "string (формат выходных данных на русском)",
-          "examples": [{"input": "string", "output": "string"}],
-          "constraints": ["string"]
-        }
-        """
-        
-        if difficulty == "easy":
-            return base_prompt + """
-            Сложность: ЛЕГКАЯ.
-            Темы: Базовые массивы, строки, простая математика, циклы.
-            Сложность алгоритма: O(n) или O(1).
-            Примеры задач: Найти максимальный элемент, подсчитать четные числа, перевернуть строку.
-            """
-        elif difficulty == "medium":
-            return base_prompt + """
-            Сложность: СРЕДНЯЯ.
-            Темы: Хеш-таблицы, Два указателя, Скользящее окно, Логика сортировки (без встроенных функций), Вложенные циклы.
-            Сложность алгоритма: O(n^2) или O(n log n).
-            Примеры задач: Первый уникальный символ, Переместить нули, Наибольший общий префикс.
-            """
-        else: # hard
-            return base_prompt + """
-            Сложность: ВЫСОКАЯ.
-            Темы: Сложные реализации сортировок (QuickSort, MergeSort), Рекурсия, Деревья, Основы динамического программирования.
-            Ограничение: Явно попроси реализовать конкретный алгоритм (например, QuickSort) вручную.
-            """
+        return _PROMPTS.get(difficulty, _PROMPTS["hard"])
 
 task_generator = TaskGenerator()
@@ -0,0 +1,47 @@
+import pytest
+
+from app.services.adaptive_engine import AdaptiveDifficultyEngine
+
+
+def _legacy_transition(current: str, passed: bool, bad_attempts: int) -> tuple[str, str]:
+    """Ветвления determine_next_level до перехода на таблицу _TRANSITIONS."""
+    next_level = current
+    reason = "Уровень сохранён."
+    if current == "medium":
+        if passed:
+            if bad_attempts >= 2:
+                next_level = "medium"
+                reason = "Пройдено, но с множественными ошибками. Закрепляем Medium."
+            else:
+                next_level = "hard"
+                reason = "Пройдено Medium успешно. Повышаем до Hard."
+        else:
+            next_level = "easy"
+            reason = "Провал Medium. Понижаем до Easy для практики."
+    elif current == "easy":
+        if passed:
+            next_level = "medium"
+            reason = "Пройдено Easy. Повышаем до Medium."
+        else:
+            next_level = "easy"
+            reason = "Провал Easy. Повторяем Easy."
+    elif current == "hard":
+        if passed:
+            next_level = "hard"
+            reason = "Пройдено Hard. Отлично! Сохраняем сложный уровень."
+        else:
+            next_level = "medium"
+            reason = "Провал Hard. Понижаем до Medium."
+    return next_level, reason
+
+
+@pytest.mark.parametrize("current", ["easy", "medium", "hard"])
+@pytest.mark.parametrize("passed", [True, False])
+@pytest.mark.parametrize("bad_attempts", [0, 1, 2, 5])
+def test_transitions_match_legacy_branches(current, passed, bad_attempts):
+    key = (current, passed, bad_attempts >= 2)
+    assert AdaptiveDifficultyEngine._TRANSITIONS[key] == _legacy_transition(current, passed, bad_attempts)
+
+
+def test_transitions_cover_every_key():
+    assert len(AdaptiveDifficultyEngine._TRANSITIONS) == 3 * 2 * 2
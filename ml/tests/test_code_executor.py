@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app.services import code_executor as executor_module
+from app.services.code_executor import CodeExecutor, RUN_TIMEOUT_SECONDS
+
+
+def _run(code, inputs, workers=2):
+    async def scenario():
+        executor = CodeExecutor()
+        executor._workers = workers
+        executor._slots = asyncio.Semaphore(workers)
+        try:
+            return await executor.execute(code, inputs)
+        finally:
+            executor._reset_pool()
+
+    return asyncio.run(scenario())
+
+
+def test_runs_each_input():
+    results = _run("print(int(input()) * 2)", ["1", "21"])
+    assert [r["output"] for r in results] == ["2", "42"]
+    assert all(r["success"] for r in results)
+
+
+def test_syntax_error_fails_every_test_without_pool():
+    results = _run("def broken(:", ["1", "2"])
+    assert len(results) == 2
+    assert not any(r["success"] for r in results)
+
+
+def test_time_limit_reports_tle():
+    (result,) = _run("while True:\n    pass", ["1"])
+    assert not result["success"]
+    assert result["error"].startswith("TLE")
+    assert f"{RUN_TIMEOUT_SECONDS:g}" in result["error"]
+
+
+@pytest.mark.parametrize("code", ["raise SystemExit(3)", "raise KeyboardInterrupt"])
+def test_base_exceptions_stay_in_worker(code):
+    (result,) = _run(code, ["1"])
+    assert not result["success"]
+    assert result["error"]
+
+
+def test_memory_limit_fails_test():
+    (result,) = _run("x = bytearray(1024 * 1024 * 1024)", ["1"])
+    assert not result["success"]
+    assert "MemoryError" in result["error"]
+
+
+def test_queued_tests_do_not_time_out(monkeypatch):
+    # Один процесс и четыре теста по 0.4 с: вместе дольше таймаута, но каждый — в пределах
+    monkeypatch.setattr(executor_module, "TEST_TIMEOUT_SECONDS", 1.0)
+    results = _run("import time\ntime.sleep(0.4)\nprint(input())", ["a", "b", "c", "d"], workers=1)
+    assert [r["output"] for r in results] == ["a", "b", "c", "d"]
+    assert all(r["success"] for r in results)
+
+
+def test_reset_kills_worker_stuck_in_c_code(monkeypatch):
+    # sum(range(...)) крутится в C: SIGALRM не срабатывает, тест прерывает только внешний таймаут
+    monkeypatch.setattr(executor_module, "TEST_TIMEOUT_SECONDS", 1.0)
+    processes = []
+    reset_pool = CodeExecutor._reset_pool
+
+    def tracking_reset(self):
+        if self._pool is not None:
+            processes.extend(self._pool._processes.values())
+        reset_pool(self)
+
+    monkeypatch.setattr(CodeExecutor, "_reset_pool", tracking_reset)
+    (result,) = _run("print(sum(range(10 ** 13)))", ["1"], workers=1)
+    assert not result["success"]
+    assert processes
+    for process in processes:
+        process.join(timeout=2)
+        assert not process.is_alive()
+
+
+def test_cpu_limit_is_rearmed_per_test():
+    code = (
+        "import resource\n"
+        "usage = resource.getrusage(resource.RUSAGE_SELF)\n"
+        "soft, _ = resource.getrlimit(resource.RLIMIT_CPU)\n"
+        "print(0 < soft - usage.ru_utime - usage.ru_stime <= 7)"
+    )
+    assert [r["output"] for r in _run(code, ["1", "2"], workers=1)] == ["True", "True"]
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import llm_client as llm_module
+from app.services.llm_client import LLMClient
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Клиент без сети и без SQLite-кэша: _request считает вызовы и отвечает после паузы."""
+    async def cache_get(key):
+        return None
+
+    async def cache_set(key, value):
+        pass
+
+    monkeypatch.setattr(llm_module.response_cache, "get", cache_get)
+    monkeypatch.setattr(llm_module.response_cache, "set", cache_set)
+
+    client = LLMClient()
+    client.calls = 0
+
+    async def fake_request(payload, stream=False):
+        client.calls += 1
+        call = client.calls
+        await asyncio.sleep(0.05)
+        return f"answer {call}"
+
+    monkeypatch.setattr(client, "_request", fake_request)
+    return client
+
+
+def test_identical_cacheable_requests_share_one_call(client):
+    async def scenario():
+        return await asyncio.gather(*(
+            client.generate("m", MESSAGES, temperature=0.0) for _ in range(3)
+        ))
+
+    assert asyncio.run(scenario()) == ["answer 1"] * 3
+    assert client.calls == 1
+    assert client._inflight == {}
+
+
+def test_non_cacheable_requests_are_not_coalesced(client):
+    temperature = settings.LLM_CACHE_MAX_TEMPERATURE + 0.5
+
+    async def scenario():
+        return await asyncio.gather(*(
+            client.generate("m", MESSAGES, temperature=temperature) for _ in range(3)
+        ))
+
+    assert sorted(asyncio.run(scenario())) == ["answer 1", "answer 2", "answer 3"]
+    assert client.calls == 3
+    assert client._inflight == {}
+
+
+def test_last_waiter_leaving_cancels_request(client):
+    async def scenario():
+        waiter = asyncio.create_task(client.generate("m", MESSAGES, temperature=0.0))
+        await asyncio.sleep(0)
+        (inflight,) = client._inflight.values()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+        return inflight.task
+
+    task = asyncio.run(scenario())
+    assert task.cancelled()
+    assert client._inflight == {}
+
+
+def test_cancelled_waiter_does_not_cancel_shared_request(client):
+    async def scenario():
+        first = asyncio.create_task(client.generate("m", MESSAGES, temperature=0.0))
+        second = asyncio.create_task(client.generate("m", MESSAGES, temperature=0.0))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "answer 1"
+    assert client.calls == 1
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('{"solution": "s = \\"```\\"\\nprint(s)", "tests": []}', {"solution": 's = "```"\nprint(s)', "tests": []}),
+    ('```json\n{"a": 1}\n```', {"a": 1}),
+    ('```json{"a": 1}```', {"a": 1}),
+    ('<think>hmm</think>\n{"a": 1}', {"a": 1}),
+])
+def test_generate_json_strips_fence_only_when_needed(client, monkeypatch, content, expected):
+    async def fake_generate(*args, **kwargs):
+        return content
+
+    monkeypatch.setattr(client, "generate", fake_generate)
+    assert asyncio.run(client.generate_json("m", [{"role": "user", "content": "json"}])) == expected
+
+
+def test_generate_json_rejects_garbage(client, monkeypatch):
+    async def fake_generate(*args, **kwargs):
+        return "not json"
+
+    monkeypatch.setattr(client, "generate", fake_generate)
+    with pytest.raises(ValueError):
+        asyncio.run(client.generate_json("m", [{"role": "user", "content": "json"}]))
@@ -0,0 +1,37 @@
+import asyncio
+
+from app.services import response_cache as cache_module
+from app.services.response_cache import ResponseCache
+
+
+def _keys(cache):
+    return {row[0] for row in cache._connect().execute("SELECT key FROM responses")}
+
+
+def test_set_purges_expired_rows(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60, max_rows=100)
+    now = 1_000_000.0
+    monkeypatch.setattr(cache_module.time, "time", lambda: now)
+    asyncio.run(cache.set("old", "a"))
+
+    now += 120
+    asyncio.run(cache.set("new", "b"))
+    assert _keys(cache) == {"new"}
+
+
+def test_set_keeps_at_most_max_rows(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=3600, max_rows=2)
+    clock = iter(range(1_000_000, 1_000_100))
+    monkeypatch.setattr(cache_module.time, "time", lambda: float(next(clock)))
+    for key in ("a", "b", "c"):
+        asyncio.run(cache.set(key, key))
+    assert _keys(cache) == {"b", "c"}
+
+
+def test_expired_rows_purged_on_open(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(cache_module.time, "time", lambda: 1_000_000.0)
+    asyncio.run(ResponseCache(path, ttl_seconds=60, max_rows=100).set("old", "a"))
+
+    monkeypatch.setattr(cache_module.time, "time", lambda: 1_000_120.0)
+    assert _keys(ResponseCache(path, ttl_seconds=60, max_rows=100)) == set()
@@ -12,6 +12,9 @@ docker system prune -f 2>/dev/null || true
 echo "🔨 Пересобираем образы..."
 docker compose build --no-cache
 
+echo "📦 Собираем образы песочниц executor..."
+docker compose --profile sandbox build
+
 echo "🚀 Запускаем сервисы..."
 docker compose up -d
 
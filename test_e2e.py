@@ -1,177 +1,387 @@
 #!/usr/bin/env python3
-"""E2E тест для проверки работы всех сервисов EXALAA"""
+"""E2E тест для проверки работы всех сервисов EXALAA
 
-import requests
+Зависимости: httpx; опционально ijson, orjson, h2 (pip install httpx ijson orjson h2)
+"""
+
+import asyncio
+import contextlib
+import httpx
+import argparse
+import json
+import os
+import socket
+import tempfile
 import time
 import sys
 
-BASE_URL = "http://localhost:8000"
-ML_URL = "http://localhost:8002"
-EXECUTOR_URL = "http://localhost:8001"
-FRONTEND_URL = "http://localhost:5173"
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
-def test_health_endpoints():
-    """Проверка health endpoints всех сервисов"""
-    print("🔍 Проверка health endpoints...")
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401 — нужен httpx для HTTP/2
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# localhost резолвится один раз при импорте: сервисы слушают 0.0.0.0 и по Host не маршрутизируют,
+# так что дальше ходим по IP без getaddrinfo на каждое соединение
+HOST = socket.gethostbyname("localhost")
+
+BASE_URL = f"http://{HOST}:8000"
+ML_URL = f"http://{HOST}:8002"
+EXECUTOR_URL = f"http://{HOST}:8001"
+FRONTEND_URL = f"http://{HOST}:5173"
+
+BACKEND_HEALTH_URL = f"{BASE_URL}/health"
+DOCS_URL = f"{BASE_URL}/docs"
+OPENAPI_URL = f"{BASE_URL}/openapi.json"
+VACANCIES_URL = f"{BASE_URL}/api/vacancies"
+ML_HEALTH_URL = f"{ML_URL}/health"
+ML_API_HEALTH_URL = f"{ML_URL}/api/v1/health"
+EXECUTOR_HEALTH_URL = f"{EXECUTOR_URL}/health"
+
+SERVICES = {
+    "Backend": BACKEND_HEALTH_URL,
+    "ML Service": ML_HEALTH_URL,
+    "Executor": EXECUTOR_HEALTH_URL,
+    "Frontend": FRONTEND_URL,
+}
+
+# Один клиент на весь прогон: соединения с одним хостом (4 запроса к Backend) переиспользуются через keep-alive,
+# а при HTTPS с HTTP/2 мультиплексируются в одно соединение
+HTTP_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=8)
+
+# Недоступный хост отваливается на connect за 1 с, а не съедает весь бюджет; PROBE_DEADLINE — потолок на запрос целиком
+HTTP_TIMEOUT = httpx.Timeout(3.0, connect=1.0)
+PROBE_DEADLINE = 3.0
+
+SWAGGER_SCAN_BYTES = 4096
+
+# Итоги прогона для частых повторных запусков (--cache-ttl): {имя теста: [время, результат]}
+CACHE_PATH = os.path.join(tempfile.gettempdir(), "exalaa_e2e_cache.json")
+
+@contextlib.asynccontextmanager
+async def _deadline(url: str):
+    """Общий дедлайн на запрос (включая чтение тела потоком)"""
+    try:
+        async with asyncio.timeout(PROBE_DEADLINE):
+            yield
+    except TimeoutError:
+        raise httpx.TimeoutException(f"нет ответа за {PROBE_DEADLINE:g} с: {url}") from None
+
+async def _get(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    async with _deadline(url):
+        return await client.get(url)
+
+async def _status(client: httpx.AsyncClient, url: str) -> int:
+    """Код ответа GET без скачивания тела (FastAPI не отвечает на HEAD для GET-роутов)"""
+    async with _deadline(url), client.stream("GET", url) as response:
+        return response.status_code
+
+# Проверки ловят только сетевые сбои (httpx.TransportError, включая таймауты); прочие исключения
+# доходят до main() и попадают в отчёт как критическая ошибка теста
+
+# Ответы по URL на время прогона: один и тот же адрес (например, {ML_URL}/health) запрашивается один раз
+_probes: dict[str, asyncio.Task] = {}
+
+async def _probe(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    """GET с мемоизацией по URL; параллельные вызовы ждут один и тот же запрос"""
+    task = _probes.get(url)
+    if task is None:
+        task = _probes[url] = asyncio.ensure_future(_get(client, url))
+    return await task
+
+def _json(content: bytes):
+    """Разбор JSON-тела: orjson, если установлен, иначе stdlib"""
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+def _load_cache() -> dict:
+    try:
+        with open(CACHE_PATH, "rb") as f:
+            return _json(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache: dict) -> None:
+    data = orjson.dumps(cache) if orjson is not None else json.dumps(cache).encode()
+    try:
+        with open(CACHE_PATH, "wb") as f:
+            f.write(data)
+    except OSError:
+        pass
+
+class _ResponseReader:
+    """Файлоподобная обёртка над потоком ответа httpx для ijson (async read)"""
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            # ijson пробует read(0), чтобы отличить bytes от str — чанк при этом не тратим
+            return b""
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+async def _count_openapi_paths(response: httpx.Response) -> int:
+    """Считает ключи paths, не собирая всю схему в памяти"""
+    if ijson is None:
+        return len(_json(await response.aread()).get('paths', {}))
+    count = 0
+    async for _path, _operations in ijson.kvitems_async(_ResponseReader(response), 'paths'):
+        count += 1
+    return count
+
+async def _healthy(client: httpx.AsyncClient, url: str) -> bool:
+    """Отвечает ли health-адрес зависимости; ответ общий с проверкой health endpoints"""
+    try:
+        return (await _probe(client, url)).is_success
+    except httpx.TransportError:
+        return False
+
+@contextlib.contextmanager
+def _report():
+    """Копит строки вывода проверки и пишет их в stdout одним write в конце"""
+    lines: list[str] = []
+    try:
+        yield lines.append
+    finally:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+async def _read_head(response: httpx.Response, limit: int) -> bytes:
+    """Первые limit байт тела ответа; остаток потока не скачивается"""
+    head = bytearray()
+    async for chunk in response.aiter_bytes():
+        head += chunk
+        if len(head) >= limit:
+            break
+    return bytes(head[:limit])
+
+def make_probe(title: str, url: str, describe, fail_label: str):
+    """Собирает проверку «GET url → 200»: url и describe(response) -> строки отчёта связаны в замыкании"""
+    async def probe(client: httpx.AsyncClient):
+        with _report() as out:
+            out(f"\n🔍 Проверка {title}...")
+            try:
+                response = await _probe(client, url)
+                if response.is_success:
+                    for line in describe(response):
+                        out(line)
+                    return True
+                out(f"  ❌ {fail_label}: HTTP {response.status_code}")
+                return False
+            except httpx.TransportError as e:
+                out(f"  ❌ Ошибка: {e}")
+                return False
     
-    services = {
-        "Backend": f"{BASE_URL}/health",
-        "ML Service": f"{ML_URL}/health",
-        "Executor": f"{EXECUTOR_URL}/health",
-        "Frontend": FRONTEND_URL,
-    }
+    probe.__doc__ = f"Проверка {title}"
+    return probe
+
+async def test_health_endpoints(client: httpx.AsyncClient):
+    """Проверка health endpoints всех сервисов"""
+    with _report() as out:
+        out("\n🔍 Проверка health endpoints...")
     
-    for name, url in services.items():
-        try:
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                print(f"  ✅ {name}: OK")
-            else:
-                print(f"  ❌ {name}: HTTP {response.status_code}")
+        async def check(name, url):
+            try:
+                response = await _probe(client, url)
+                if response.is_success:
+                    out(f"  ✅ {name}: OK")
+                    return True
+                out(f"  ❌ {name}: HTTP {response.status_code}")
+                return False
+            except httpx.TransportError as e:
+                out(f"  ❌ {name}: {e}")
                 return False
-        except Exception as e:
-            print(f"  ❌ {name}: {e}")
-            return False
     
-    return True
+        # Сервисы опрашиваются параллельно: общее время — самый медленный ответ, а не сумма таймаутов
+        ok = await asyncio.gather(*(check(name, url) for name, url in SERVICES.items()))
+        return all(ok)
 
-def test_swagger_api():
+async def test_swagger_api(client: httpx.AsyncClient):
     """Проверка доступности Swagger API"""
-    print("\n🔍 Проверка Swagger API...")
+    with _report() as out:
+        out("\n🔍 Проверка Swagger API...")
     
-    try:
-        response = requests.get(f"{BASE_URL}/docs", timeout=5)
-        if response.status_code == 200 and "swagger" in response.text.lower():
-            print("  ✅ Swagger API доступен")
-            return True
-        else:
-            print("  ❌ Swagger API недоступен")
+        try:
+            # Маркер swagger стоит в начале страницы — читаем только первые SWAGGER_SCAN_BYTES байт
+            async with _deadline(DOCS_URL), client.stream("GET", DOCS_URL) as response:
+                if response.is_success and b"swagger" in (await _read_head(response, SWAGGER_SCAN_BYTES)).lower():
+                    out("  ✅ Swagger API доступен")
+                    return True
+                else:
+                    out("  ❌ Swagger API недоступен")
+                    return False
+        except httpx.TransportError as e:
+            out(f"  ❌ Ошибка: {e}")
             return False
-    except Exception as e:
-        print(f"  ❌ Ошибка: {e}")
-        return False
 
-def test_openapi_schema():
+async def test_openapi_schema(client: httpx.AsyncClient):
     """Проверка OpenAPI схемы"""
-    print("\n🔍 Проверка OpenAPI схемы...")
+    with _report() as out:
+        out("\n🔍 Проверка OpenAPI схемы...")
     
-    try:
-        response = requests.get(f"{BASE_URL}/openapi.json", timeout=5)
-        if response.status_code == 200:
-            schema = response.json()
-            print(f"  ✅ OpenAPI схема загружена")
-            print(f"  📊 Найдено endpoints: {len(schema.get('paths', {}))}")
-            return True
-        else:
-            print("  ❌ OpenAPI схема недоступна")
+        try:
+            # Схема нужна только для подсчёта paths — читаем её потоком
+            async with _deadline(OPENAPI_URL), client.stream("GET", OPENAPI_URL) as response:
+                if response.is_success:
+                    paths_count = await _count_openapi_paths(response)
+                    out(f"  ✅ OpenAPI схема загружена")
+                    out(f"  📊 Найдено endpoints: {paths_count}")
+                    return True
+                else:
+                    out("  ❌ OpenAPI схема недоступна")
+                    return False
+        except httpx.TransportError as e:
+            out(f"  ❌ Ошибка: {e}")
             return False
-    except Exception as e:
-        print(f"  ❌ Ошибка: {e}")
-        return False
 
-def test_vacancies_endpoint():
-    """Проверка endpoint вакансий"""
-    print("\n🔍 Проверка endpoint вакансий...")
-    
-    try:
-        response = requests.get(f"{BASE_URL}/api/vacancies", timeout=5)
-        if response.status_code == 200:
-            vacancies = response.json()
-            print(f"  ✅ Вакансии загружены: {len(vacancies)} шт.")
-            if vacancies:
-                print(f"  📋 Пример: {vacancies[0].get('title', 'N/A')}")
-            return True
-        else:
-            print(f"  ❌ Ошибка: HTTP {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"  ❌ Ошибка: {e}")
-        return False
+def _describe_vacancies(response: httpx.Response) -> list[str]:
+    vacancies = _json(response.content)
+    lines = [f"  ✅ Вакансии загружены: {len(vacancies)} шт."]
+    if vacancies:
+        lines.append(f"  📋 Пример: {vacancies[0].get('title', 'N/A')}")
+    return lines
 
-def test_ml_service():
+def _describe_executor(response: httpx.Response) -> list[str]:
+    return [f"  ✅ Executor работает: {_json(response.content)}"]
+
+# Проверки вида «GET → 200 → отчёт» собираются фабрикой, а не дублируются
+test_vacancies_endpoint = make_probe("endpoint вакансий", VACANCIES_URL, _describe_vacancies, "Ошибка")
+
+async def test_ml_service(client: httpx.AsyncClient):
     """Проверка ML сервиса"""
-    print("\n🔍 Проверка ML сервиса...")
+    with _report() as out:
+        out("\n🔍 Проверка ML сервиса...")
     
-    try:
-        response = requests.get(f"{ML_URL}/api/v1/health", timeout=5)
-        if response.status_code == 200:
-            print("  ✅ ML сервис работает")
-            return True
-        else:
-            # Пробуем альтернативный endpoint
-            response = requests.get(f"{ML_URL}/health", timeout=5)
-            if response.status_code == 200:
-                print("  ✅ ML сервис работает")
+        try:
+            # /health уже запрошен проверкой health endpoints — берём мемоизированный ответ, без второго запроса
+            response = await _probe(client, ML_HEALTH_URL)
+            if response.is_success:
+                out("  ✅ ML сервис работает")
                 return True
-            print(f"  ❌ ML сервис недоступен: HTTP {response.status_code}")
+            else:
+                # Пробуем альтернативный endpoint; нужен только статус, тело не читаем
+                status_code = await _status(client, ML_API_HEALTH_URL)
+                if httpx.codes.is_success(status_code):
+                    out("  ✅ ML сервис работает")
+                    return True
+                out(f"  ❌ ML сервис недоступен: HTTP {status_code}")
+                return False
+        except httpx.TransportError as e:
+            out(f"  ❌ Ошибка: {e}")
             return False
-    except Exception as e:
-        print(f"  ❌ Ошибка: {e}")
-        return False
 
-def test_executor_service():
-    """Проверка Executor сервиса"""
-    print("\n🔍 Проверка Executor сервиса...")
-    
-    try:
-        response = requests.get(f"{EXECUTOR_URL}/health", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            print(f"  ✅ Executor работает: {data}")
-            return True
-        else:
-            print(f"  ❌ Executor недоступен: HTTP {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"  ❌ Ошибка: {e}")
-        return False
+test_executor_service = make_probe("Executor сервиса", EXECUTOR_HEALTH_URL, _describe_executor, "Executor недоступен")
 
-def main():
-    """Запуск всех тестов"""
-    print("=" * 60)
-    print("🚀 E2E ТЕСТИРОВАНИЕ ПРОЕКТА EXALAA")
-    print("=" * 60)
+async def main(cache_ttl: float = 0.0):
+    """Запуск всех тестов; результаты моложе cache_ttl секунд берутся из кэша без обращения к сети"""
+    with _report() as out:
+        out("=" * 60)
+        out("🚀 E2E ТЕСТИРОВАНИЕ ПРОЕКТА EXALAA")
+        out("=" * 60)
     
+    # (имя, проверка, depends_on): depends_on — health-адреса сервисов, без которых проверка не имеет смысла;
+    # если какой-то из них не отвечает, проверка не запускается и сразу считается FAILED
     tests = [
-        ("Health Endpoints", test_health_endpoints),
-        ("Swagger API", test_swagger_api),
-        ("OpenAPI Schema", test_openapi_schema),
-        ("Vacancies Endpoint", test_vacancies_endpoint),
-        ("ML Service", test_ml_service),
-        ("Executor Service", test_executor_service),
+        ("Health Endpoints", test_health_endpoints, ()),
+        ("Swagger API", test_swagger_api, (BACKEND_HEALTH_URL,)),
+        ("OpenAPI Schema", test_openapi_schema, (BACKEND_HEALTH_URL,)),
+        ("Vacancies Endpoint", test_vacancies_endpoint, (BACKEND_HEALTH_URL,)),
+        ("ML Service", test_ml_service, ()),
+        ("Executor Service", test_executor_service, ()),
     ]
     
-    results = []
-    for name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((name, result))
-        except Exception as e:
-            print(f"\n❌ Критическая ошибка в тесте '{name}': {e}")
-            results.append((name, False))
-    
-    # Итоговый отчет
-    print("\n" + "=" * 60)
-    print("📊 ИТОГОВЫЙ ОТЧЕТ")
-    print("=" * 60)
-    
-    passed = sum(1 for _, result in results if result)
-    total = len(results)
-    
-    for name, result in results:
-        status = "✅ PASSED" if result else "❌ FAILED"
-        print(f"{status}: {name}")
-    
-    print("\n" + "=" * 60)
-    print(f"Результат: {passed}/{total} тестов пройдено")
-    print("=" * 60)
-    
-    if passed == total:
-        print("\n🎉 ВСЕ ТЕСТЫ ПРОЙДЕНЫ УСПЕШНО!")
-        return 0
-    else:
-        print(f"\n⚠️  ПРОВАЛЕНО ТЕСТОВ: {total - passed}")
-        return 1
+    cache = _load_cache() if cache_ttl > 0 else {}
+    fresh: set[str] = set()
+    started = time.time()
+    
+    # Все проверки — сетевое ожидание: запускаем их одновременно на общем клиенте (пул keep-alive соединений)
+    async with httpx.AsyncClient(http2=HTTP2, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS) as client:
+        tasks: dict[str, asyncio.Task] = {}
+        
+        async def run(name, test_func, depends_on):
+            cached = cache.get(name)
+            if cached is not None and started - cached[0] < cache_ttl:
+                with _report() as out:
+                    out(f"\n♻️  {name}: результат из кэша ({started - cached[0]:.0f} с назад)")
+                return cached[1]
+            fresh.add(name)
+            failed = [dep for dep in depends_on if not await _healthy(client, dep)]
+            if failed:
+                with _report() as out:
+                    out(f"\n⏭️  {name}: пропущен, недоступно: {', '.join(failed)}")
+                return False
+            return await test_func(client)
+        
+        async def settle(name):
+            try:
+                return name, await tasks[name]
+            except Exception as e:
+                return name, e
+        
+        for name, test_func, depends_on in tests:
+            tasks[name] = asyncio.ensure_future(run(name, test_func, depends_on))
+        
+        # Итоги разбираем по мере завершения проверок, пока остальные ещё ждут сеть
+        outcomes = {}
+        for settled in asyncio.as_completed([settle(name) for name in tasks]):
+            name, outcome = await settled
+            if isinstance(outcome, BaseException):
+                with _report() as out:
+                    out(f"\n❌ Критическая ошибка в тесте '{name}': {outcome}")
+                outcome = False
+            outcomes[name] = outcome
+    
+    results = [(name, outcomes[name]) for name in tasks]
+    
+    if cache_ttl > 0 and fresh:
+        cache.update((name, [started, bool(outcomes[name])]) for name in fresh)
+        _save_cache(cache)
+    
+    with _report() as out:
+        # Итоговый отчет
+        out("\n" + "=" * 60)
+        out("📊 ИТОГОВЫЙ ОТЧЕТ")
+        out("=" * 60)
+    
+        passed = sum(1 for _, result in results if result)
+        total = len(results)
+    
+        for name, result in results:
+            status = "✅ PASSED" if result else "❌ FAILED"
+            out(f"{status}: {name}")
+    
+        out("\n" + "=" * 60)
+        out(f"Результат: {passed}/{total} тестов пройдено")
+        out("=" * 60)
+    
+        if passed == total:
+            out("\n🎉 ВСЕ ТЕСТЫ ПРОЙДЕНЫ УСПЕШНО!")
+            return 0
+        else:
+            out(f"\n⚠️  ПРОВАЛЕНО ТЕСТОВ: {total - passed}")
+            return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cache-ttl", type=float, default=0.0,
+                        help="секунды, в течение которых результаты прошлого прогона берутся из кэша (0 — без кэша)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.cache_ttl)))